@@ -0,0 +1,5 @@
+# QLED-RLopt: the RL environment core lives in qled_env.qled_env; re-exported here.
+from .qled_env.parameter_space import ParamDef, ParameterSpace
+from .qled_env.reward_function import compute_reward, compute_reward_scalar
+
+__all__ = ["ParamDef", "ParameterSpace", "compute_reward", "compute_reward_scalar"]
@@ -0,0 +1,28 @@
+"""
+Numba kernels for COMSOL post-processing (see comsol_parser.py).
+"""
+from .qled_env._jit import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _overlap_stats(ne, nh, R_rad, R_nrad):
+    """
+    Single fused pass over the mesh: sum(ne*nh), sum(ne^2), sum(nh^2), sum(R_rad), sum(R_nrad).
+    """
+    s_ab = 0.0
+    s_aa = 0.0
+    s_bb = 0.0
+    s_rad = 0.0
+    s_nrad = 0.0
+    for i in prange(ne.shape[0]):
+        a = ne[i]
+        b = nh[i]
+        s_ab += a * b
+        s_aa += a * a
+        s_bb += b * b
+        s_rad += R_rad[i]
+        s_nrad += R_nrad[i]
+    return s_ab, s_aa, s_bb, s_rad, s_nrad
+
+
+__all__ = ["_overlap_stats", "NUMBA_AVAILABLE"]
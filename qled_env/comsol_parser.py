@@ -2,7 +2,71 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
-def parse_comsol_csv(path) -> dict:
+from ._kernels import _overlap_stats, NUMBA_AVAILABLE
+
+# Columns we actually consume; everything else in the export is skipped at parse time.
+_COMSOL_COLUMNS = ("x", "y", "z", "n_electron", "n_hole", "R_rad", "R_nrad")
+_COMSOL_DTYPES = {col: np.float32 for col in _COMSOL_COLUMNS}
+_REDUCTION_COLUMNS = ("n_electron", "n_hole", "R_rad", "R_nrad")
+
+
+def _reduce_frame(df: pd.DataFrame) -> np.ndarray:
+    """
+    Return [sum(ne*nh), sum(ne^2), sum(nh^2), sum(R_rad), sum(R_nrad)] for one frame.
+    """
+    # float64 on purpose: carrier densities (~1e24 m^-3) overflow float32 once squared
+    ne = df["n_electron"].to_numpy(dtype=np.float64)
+    nh = df["n_hole"].to_numpy(dtype=np.float64)
+    R_rad = df["R_rad"].to_numpy(dtype=np.float64)
+    R_nrad = df["R_nrad"].to_numpy(dtype=np.float64)
+
+    if NUMBA_AVAILABLE:
+        # one fused, multi-core pass instead of five separate reductions
+        return np.array(_overlap_stats(ne, nh, R_rad, R_nrad), dtype=np.float64)
+
+    # einsum fuses multiply + reduce, so no ne*nh / ne**2 / nh**2 temporaries
+    return np.array(
+        [
+            np.einsum("i,i->", ne, nh),
+            np.einsum("i,i->", ne, ne),
+            np.einsum("i,i->", nh, nh),
+            np.sum(R_rad, dtype=np.float64),
+            np.sum(R_nrad, dtype=np.float64),
+        ],
+        dtype=np.float64,
+    )
+
+
+def _scalar_metrics(sums: np.ndarray) -> dict:
+    s_ab, s_aa, s_bb, total_rad, total_nrad = (float(v) for v in sums)
+
+    # Spatial overlap between electrons and holes
+    if s_aa == 0.0 or s_bb == 0.0:
+        overlap = 0.0
+    else:
+        overlap = float(s_ab / (np.sqrt(s_aa) * np.sqrt(s_bb) + 1e-12))
+
+    total = total_rad + total_nrad + 1e-18
+
+    # Internal EQE proxy
+    eqe_proxy = total_rad / total
+
+    # Simple penalty: large non-rad fraction
+    penalty = float((total_nrad / total) * 0.2)
+
+    return {
+        "EQE": float(eqe_proxy),
+        "recomb_overlap": overlap,
+        "penalty": penalty,
+    }
+
+
+def parse_comsol_csv(
+    path,
+    stream_only: bool = False,
+    chunksize: int = 1_000_000,
+    as_arrays: bool = False,
+) -> dict:
     """
     Parse COMSOL-exported CSV for QLED device simulation.
 
@@ -12,38 +76,45 @@ def parse_comsol_csv(path) -> dict:
       - n_hole
       - R_rad        # radiative recombination rate density
       - R_nrad       # non-radiative recombination rate density
+
+    With stream_only=True the file is read in `chunksize`-row pieces and only the
+    scalar metrics (EQE, recomb_overlap, penalty) are returned, so memory stays
+    bounded regardless of the export size. carrier_map / recomb_profile are omitted.
+
+    With as_arrays=True, carrier_map / recomb_profile are C-contiguous float32
+    (N, C) ndarrays instead of DataFrames; their column order is reported under
+    "carrier_columns" / "recomb_columns".
     """
     path = Path(path)
-    df = pd.read_csv(path)
 
+    # Probe the header first so we can restrict parsing to the columns we need.
+    header = pd.read_csv(path, nrows=0).columns
     required = {"x", "n_electron", "n_hole", "R_rad", "R_nrad"}
-    missing = required - set(df.columns)
+    missing = required - set(header)
     if missing:
         raise ValueError(f"Missing required columns in COMSOL CSV: {missing}")
 
-    ne = df["n_electron"].to_numpy()
-    nh = df["n_hole"].to_numpy()
-    R_rad = df["R_rad"].to_numpy()
-    R_nrad = df["R_nrad"].to_numpy()
-
-    # Spatial overlap between electrons and holes
-    if np.all(ne == 0) or np.all(nh == 0):
-        overlap = 0.0
-    else:
-        overlap = float(
-            np.sum(ne * nh)
-            / (np.sqrt(np.sum(ne**2)) * np.sqrt(np.sum(nh**2)) + 1e-12)
-        )
-
-    total_rad = float(np.sum(R_rad))
-    total_nrad = float(np.sum(R_nrad))
-    total = total_rad + total_nrad + 1e-18
+    if stream_only:
+        sums = np.zeros(5, dtype=np.float64)
+        for chunk in pd.read_csv(
+            path,
+            usecols=list(_REDUCTION_COLUMNS),
+            dtype={c: _COMSOL_DTYPES[c] for c in _REDUCTION_COLUMNS},
+            engine="c",
+            chunksize=chunksize,
+        ):
+            sums += _reduce_frame(chunk)
+        return _scalar_metrics(sums)
 
-    # Internal EQE proxy
-    eqe_proxy = total_rad / total
+    usecols = [c for c in _COMSOL_COLUMNS if c in header]
+    df = pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype={c: _COMSOL_DTYPES[c] for c in usecols},
+        engine="c",
+    )
 
-    # Simple penalty: large non-rad fraction
-    penalty = float((total_nrad / total) * 0.2)
+    metrics = _scalar_metrics(_reduce_frame(df))
 
     has_y = "y" in df.columns
 
@@ -53,10 +124,19 @@ def parse_comsol_csv(path) -> dict:
         carrier_cols.insert(1, "y")
         recomb_cols.insert(1, "y")
 
+    if as_arrays:
+        # .to_numpy() on float32 columns is zero-copy; stack gives one contiguous block
+        return {
+            "carrier_map": np.stack([df[c].to_numpy() for c in carrier_cols], axis=1),
+            "recomb_profile": np.stack([df[c].to_numpy() for c in recomb_cols], axis=1),
+            "carrier_columns": tuple(carrier_cols),
+            "recomb_columns": tuple(recomb_cols),
+            **metrics,
+        }
+
+    # With copy-on-write (default since pandas 3.0) these subsets are lazy, not copies.
     return {
         "carrier_map": df[carrier_cols],
         "recomb_profile": df[recomb_cols],
-        "EQE": float(eqe_proxy),
-        "recomb_overlap": overlap,
-        "penalty": penalty,
+        **metrics,
     }
@@ -0,0 +1,46 @@
+import numpy as np
+
+# The RL parameter space itself has a single definition in the core package.
+from .qled_env.parameter_space import ParamDef, ParameterSpace  # noqa: F401
+
+# Legacy design-dict space consumed by QLEDSimulator (see data/data_designs.csv).
+# Continuous parameters: (name, low, high); QD_layers is drawn separately as an int.
+_CONTINUOUS = (
+    ("ZnO_ratio", 0.20, 0.80),
+    ("HTL_thickness_nm", 10.0, 40.0),
+    ("ZnO_thickness_nm", 15.0, 50.0),
+    ("bias_V", 2.5, 4.5),
+)
+_QD_LAYERS = (1, 4)  # integers in [1, 4) -> 1..3
+
+_NAMES = tuple(name for name, _, _ in _CONTINUOUS)
+_LOW = np.array([lo for _, lo, _ in _CONTINUOUS], dtype=np.float64)
+_SPAN = np.array([hi - lo for _, lo, hi in _CONTINUOUS], dtype=np.float64)
+
+# One cached Generator instead of the legacy global RandomState
+_RNG = np.random.default_rng()
+
+
+def sample_design(rng: np.random.Generator | None = None, n: int | None = None) -> dict:
+    """
+    Sample a random QLED design dict for QLEDSimulator.
+
+    All continuous parameters come from a single uniform draw; pass `rng` for
+    reproducible sampling, otherwise a module-level Generator is used.
+
+    With `n`, samples n designs at once and returns them as columns
+    ({name: (n,) array}, QD_layers as an integer column) for
+    QLEDSimulator.evaluate_batch.
+    """
+    rng = _RNG if rng is None else rng
+    if n is not None:
+        vals = _LOW + rng.uniform(size=(n, len(_NAMES))) * _SPAN
+        designs = {name: vals[:, j] for j, name in enumerate(_NAMES)}
+        designs["QD_layers"] = rng.integers(*_QD_LAYERS, size=n)
+        return designs
+
+    vals = _LOW + rng.uniform(size=len(_NAMES)) * _SPAN
+
+    design = dict(zip(_NAMES, vals.tolist()))
+    design["QD_layers"] = int(rng.integers(*_QD_LAYERS))
+    return design
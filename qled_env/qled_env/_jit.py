@@ -0,0 +1,33 @@
+"""
+Optional Numba support.
+
+numba is not a hard dependency: when it is missing, `njit` degrades to a no-op
+decorator and `prange` to `range`, so decorated kernels still run as plain
+Python. Hot paths should check NUMBA_AVAILABLE and keep a NumPy fallback rather
+than calling a pure-Python loop kernel.
+
+Kernels are compiled with cache=True; numba's own NUMBA_CACHE_DIR chooses where
+the on-disk cache lives (see README).
+"""
+from __future__ import annotations
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # supports both @njit and @njit(cache=True, ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def _wrap(fn):
+            return fn
+
+        return _wrap
+
+
+__all__ = ["njit", "prange", "NUMBA_AVAILABLE"]
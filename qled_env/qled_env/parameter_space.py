@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple, Union
 import numpy as np
 
 
@@ -47,64 +47,171 @@ class ParameterSpace:
         ]
 
         self.names = [p.name for p in self.params]
+        self._names_tuple = tuple(self.names)
         self.dim = len(self.params)
+        self.idx: Dict[str, int] = {n: i for i, n in enumerate(self.names)}
+
+        # SoA bounds so the normalized <-> real maps are plain vector ops
+        self._low = np.array([p.low for p in self.params], dtype=np.float64)
+        self._high = np.array([p.high for p in self.params], dtype=np.float64)
+        self._span = self._high - self._low
+        self._inv_span = 1.0 / (self._span + 1e-12)
+        # [-1, 1] <-> [low, high] as one multiply-add each way
+        self._half_span = 0.5 * self._span
+        self._center = 0.5 * (self._low + self._high)
+        self._inv_half_span = 2.0 * self._inv_span
+
+        # Linear constraints as violation = max(0, C @ x_real + cb), one row each
+        rows = [
+            ("t_total_over_180nm", {"t_HTL_nm": 1.0, "t_EML_nm": 1.0, "t_ETL_nm": 1.0}, -180.0),
+            ("ps_fill_frac_over_0p45", {"ps_fill_frac": 1.0}, -0.45),
+            ("sl_gap_under_0p5um", {"sl_gap_um": -1.0}, 0.5),
+            ("V_drive_over_5p5V", {"V_drive": 1.0}, -5.5),
+        ]
+        self.constraint_names = tuple(name for name, _, _ in rows)
+        self._C = np.zeros((len(rows), self.dim), dtype=np.float64)
+        self._cb = np.array([b for _, _, b in rows], dtype=np.float64)
+        for r, (_, coeffs, _) in enumerate(rows):
+            for pname, c in coeffs.items():
+                self._C[r, self.idx[pname]] = c
+
+        # The schema is fixed here, so also specialize the scalar path once:
+        # a generated function of positional floats with the constants inlined.
+        self._constraint_rows = rows
+        self._viol_fn = self._build_violation_fn(rows)
 
         # Keep 0 for now (we won't append metrics to obs yet)
         self.metrics_dim = 0
 
     # ---- sampling ----
-    def sample_normalized(self, rng: np.random.Generator) -> np.ndarray:
-        """Sample x in [-1, 1]^dim uniformly."""
-        return rng.uniform(-1.0, 1.0, size=(self.dim,)).astype(np.float32)
+    def sample_normalized(self, rng: np.random.Generator, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Sample x in [-1, 1]^dim uniformly.
+
+        With `out` (a float32 array of shape (dim,)) the sample is drawn as float32
+        straight into that buffer, with no allocation or float64 -> float32 cast.
+        Note this consumes the rng stream differently from the default path.
+        """
+        if out is None:
+            return rng.uniform(-1.0, 1.0, size=(self.dim,)).astype(np.float32)
+        rng.random(size=self.dim, dtype=np.float32, out=out)
+        out *= 2.0
+        out -= 1.0
+        return out
 
     # ---- mapping: normalized <-> real ----
+    def to_real_vec(self, x_norm: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Map normalized vector x in [-1, 1]^D to physical values, ordered as self.names.
+
+        With `out` (a float64 array shaped like x_norm) the result is written in place,
+        with no temporaries; the values are identical to the allocating path.
+        Either way it is center + x * half_span, broadcast over an (N, D) batch too.
+        """
+        if out is None:
+            x = np.clip(np.asarray(x_norm, dtype=np.float64), -1.0, 1.0)
+            return x * self._half_span + self._center
+        np.clip(x_norm, -1.0, 1.0, out=out)
+        out *= self._half_span
+        out += self._center
+        return out
+
     def to_real(self, x_norm: np.ndarray) -> Dict[str, float]:
         """Map normalized vector x in [-1, 1]^D to physical parameter dict."""
-        x = np.asarray(x_norm, dtype=np.float64)
-        x = np.clip(x, -1.0, 1.0)
-
-        out: Dict[str, float] = {}
-        for i, p in enumerate(self.params):
-            u = (x[i] + 1.0) / 2.0  # [-1,1] -> [0,1]
-            val = p.low + u * (p.high - p.low)
-            out[p.name] = float(val)
-        return out
+        return dict(zip(self.names, self.to_real_vec(x_norm).tolist()))
 
-    def to_normalized(self, params_dict: Dict[str, float]) -> np.ndarray:
-        """Map physical parameter dict to normalized vector x in [-1, 1]^D."""
-        x = np.zeros((self.dim,), dtype=np.float32)
-        for i, p in enumerate(self.params):
-            v = float(params_dict[p.name])  # strict: must exist
-            v = min(max(v, p.low), p.high)
-            u = (v - p.low) / (p.high - p.low + 1e-12)  # [0,1]
-            x[i] = float(2.0 * u - 1.0)  # [-1,1]
-        return x
+    def to_normalized(self, params: Union[Dict[str, float], np.ndarray]) -> np.ndarray:
+        """
+        Map physical parameters to normalized vector x in [-1, 1]^D.
+
+        `params` is the physical dict, or an ndarray already ordered as self.names
+        (e.g. from to_real_vec), which skips the per-name gather.
+        """
+        if isinstance(params, np.ndarray):
+            v = params.astype(np.float64, copy=False)
+        else:
+            # strict: every name must exist
+            v = np.fromiter((params[n] for n in self._names_tuple), dtype=np.float64, count=self.dim)
+        v = np.clip(v, self._low, self._high)
+        return ((v - self._center) * self._inv_half_span).astype(np.float32)  # [-1,1]
+
+    # ---- pickling: the exec-generated _viol_fn is not picklable, rebuild it on load ----
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_viol_fn"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._viol_fn = self._build_violation_fn(self._constraint_rows)
 
     # ---- constraints ----
-    def constraint_violation(self, params: Dict[str, float]) -> Dict[str, float]:
+    def _build_violation_fn(self, rows):
+        """Generate `_viol(p) -> tuple` for the constraint rows (p indexed like self.names)."""
+        exprs = []
+        for _, coeffs, bias in rows:
+            terms = []
+            for pname, c in coeffs.items():
+                ref = f"p[{self.idx[pname]}]"
+                if c == 1.0:
+                    terms.append(f"+{ref}")
+                elif c == -1.0:
+                    terms.append(f"-{ref}")
+                else:
+                    terms.append(f"+{c!r}*{ref}")
+            lin = "".join(terms).lstrip("+")
+            exprs.append(f"max(0.0, {lin}{bias:+.17g})")
+        src = f"def _viol(p):\n    return ({', '.join(exprs)},)\n"
+        ns: Dict[str, Any] = {}
+        exec(compile(src, "<ParameterSpace._viol>", "exec"), ns)
+        return ns["_viol"]
+
+    def constraint_violation_vec(self, x_real: np.ndarray) -> np.ndarray:
         """
-        Return constraint violations (>=0 means violated).
-        We keep it simple but realistic; you can extend without breaking the interface.
+        Branchless violations for to_real_vec() output, ordered as self.constraint_names.
+        Accepts a (D,) vector or an (N, D) batch.
         """
-        v: Dict[str, float] = {}
-
-        t_total = params["t_HTL_nm"] + params["t_EML_nm"] + params["t_ETL_nm"]
-        v["t_total_over_180nm"] = max(0.0, t_total - 180.0)
-
-        v["ps_fill_frac_over_0p45"] = max(0.0, params["ps_fill_frac"] - 0.45)
+        return np.maximum(0.0, x_real @ self._C.T + self._cb)
 
-        v["sl_gap_under_0p5um"] = max(0.0, 0.5 - params["sl_gap_um"])
-
-        v["V_drive_over_5p5V"] = max(0.0, params["V_drive"] - 5.5)
+    def constraint_violation_values(self, params: Union[Dict[str, float], np.ndarray, List[float]]) -> Tuple[float, ...]:
+        """
+        Constraint violations as a fixed-order tuple (ordered as self.constraint_names),
+        without building the per-step dict. Accepted by compute_reward and is_hard_invalid.
+        """
+        if isinstance(params, np.ndarray):
+            p = params.tolist()
+        elif isinstance(params, list):
+            p = params  # already to_real_vec(...).tolist()
+        else:
+            p = [params[n] for n in self._names_tuple]
+        return self._viol_fn(p)
+
+    def constraint_violation(self, params: Union[Dict[str, float], np.ndarray]) -> Dict[str, float]:
+        """
+        Return constraint violations (>=0 means violated).
+        We keep it simple but realistic; you can extend without breaking the interface.
 
-        return v
+        `params` is either the physical dict or the to_real_vec() vector.
+        """
+        return dict(zip(self.constraint_names, self.constraint_violation_values(params)))
 
     def is_hard_invalid(self, violation: Any) -> bool:
         """Terminate early if violations are extreme."""
         if isinstance(violation, dict):
             return any(float(val) > 20.0 for val in violation.values())
+        if isinstance(violation, (tuple, list)):
+            return any(float(val) > 20.0 for val in violation)
+        if isinstance(violation, np.ndarray):
+            return bool(np.any(violation > 20.0))
         return float(violation) > 20.0
 
     # ---- metrics vectorization (optional) ----
-    def metrics_to_vec(self, metrics: Dict[str, Any]) -> np.ndarray:
-        return np.zeros((0,), dtype=np.float32)
+    def metrics_to_vec(self, metrics: Dict[str, Any], out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Metrics part of the observation, (metrics_dim,) float32.
+        With `out` (e.g. the tail slice of an obs buffer) it is written in place.
+        """
+        if out is None:
+            return np.zeros((self.metrics_dim,), dtype=np.float32)
+        out[...] = 0.0
+        return out
@@ -1,114 +1,800 @@
 from __future__ import annotations
-from typing import Dict, Any, Tuple
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Tuple, ClassVar
 import math
+from math import isnan, log1p, sqrt, tanh
+from operator import attrgetter
 
+import numpy as np
 
-def _clamp(x: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, x))
+from ._jit import njit, prange, NUMBA_AVAILABLE
 
 
-def _safe_float(x: Any, default: float = 0.0) -> float:
-    try:
-        v = float(x)
-        if math.isnan(v) or math.isinf(v):
+# Pure-Python helpers bind builtins / math functions as default arguments, so each
+# use is a LOAD_FAST instead of a global (+ attribute) lookup. The njit kernels
+# below take module-level math imports instead; Numba resolves those at compile time.
+def _clamp(x: float, lo: float, hi: float, _max=max, _min=min) -> float:
+    return _max(lo, _min(hi, x))
+
+
+_INF = float("inf")
+_NINF = -_INF
+_NAN = math.nan
+
+
+def _safe_float(x: Any, default: float = 0.0, _float=float, _inf=_INF, _ninf=_NINF) -> float:
+    # fast path: already a float (the common case coming out of the simulators)
+    if type(x) is _float:
+        v = x
+    else:
+        try:
+            v = _float(x)
+        except Exception:
             return default
-        return v
-    except Exception:
+    # v != v is the NaN test, without the math.isnan attribute lookup
+    if v != v or v == _inf or v == _ninf:
         return default
+    return v
 
 
-def _log1p_norm(x: float, ref: float) -> float:
-    """log1p scaling; x=ref -> ~1.0, clamped."""
-    x = max(0.0, float(x))
-    ref = max(1e-12, float(ref))
-    return _clamp(math.log1p(x) / math.log1p(ref), 0.0, 2.0)
+# 1 / log1p(ref) for the reference scales the reward uses, computed once at import.
+_INV_LOG1P = {ref: 1.0 / math.log1p(ref) for ref in (1.0, 25.0, 30.0, 40.0, 45.0, 1500.0, 2000.0)}
 
 
-def compute_reward(metrics: Dict[str, Any], violation: Any = 0.0) -> Tuple[float, Dict[str, Any]]:
+def _log1p_norm(x: float, ref: float, _log1p=log1p, _min=min, _inv=_INV_LOG1P) -> float:
+    """log1p scaling; x=ref -> ~1.0, clamped."""
+    x = float(x)
+    if not x > 0.0:
+        return 0.0
+    inv = _inv.get(ref)
+    if inv is None:
+        inv = 1.0 / _log1p(max(1e-12, float(ref)))
+    return _min(2.0, _log1p(x) * inv)
+
+
+# Scalar metrics read by the reward, in a fixed order, with their fallback values.
+_KEYS = (
+    "EQE",
+    "recomb_overlap",
+    "inj_balance",
+    "droop",
+    "brightness",
+    "lifetime",
+    "leakage",
+    "auger_rate",
+    "penalty",
+    "delta_params_norm",
+    "boundary_penalty",
+    "eml_thin_penalty",
+    "V_drive",
+)
+_DEFAULTS = np.array([1.0 if k == "droop" else 0.0 for k in _KEYS], dtype=np.float64)
+
+# Legacy key accepted when the primary key is absent.
+_ALIASES = {"auger_rate": "auger"}
+
+# (key, alias or None, default) resolved once at import for the scalar hot path
+_KEY_SPECS = tuple((k, _ALIASES.get(k), d) for k, d in zip(_KEYS, _DEFAULTS.tolist()))
+_MISSING = object()
+# slotted metrics objects (e.g. SurrogateMetrics) expose _KEYS as attributes
+_ATTR_GATHER = attrgetter(*_KEYS)
+_DEFAULT_LIST = tuple(_DEFAULTS.tolist())
+
+
+def _pick(metrics: Dict[str, Any], key: str, alias: str | None, default: float) -> Any:
+    v = metrics.get(key, _MISSING)
+    if v is _MISSING:
+        v = default if alias is None else metrics.get(alias, default)
+    return v
+
+
+def _gather_scalars(
+    metrics: Dict[str, Any],
+    _safe=_safe_float,
+    _missing=_MISSING,
+    _specs=_KEY_SPECS,
+    _dict=dict,
+    _attrs=_ATTR_GATHER,
+    _defaults=_DEFAULT_LIST,
+) -> list:
+    """_KEYS metrics as a list of Python floats; NaN/inf/missing -> per-key default."""
+    if type(metrics) is not _dict:
+        try:
+            raw = _attrs(metrics)
+        except AttributeError:
+            pass  # some other Mapping: key lookups below
+        else:
+            return [_safe(v, d) for v, d in zip(raw, _defaults)]
+    get = metrics.get
+    out = []
+    append = out.append
+    for k, alias, d in _specs:
+        # same lookup as _pick, inlined
+        v = get(k, _missing)
+        if v is _missing:
+            v = d if alias is None else get(alias, d)
+        append(_safe(v, d))
+    return out
+
+
+def _gather_metrics(metrics: Dict[str, Any]) -> np.ndarray:
     """
-    Reward v10: Efficiency + Reliability + Anti-cheat (boundaries & low-V tricks)
+    Pull the _KEYS metrics into one float64 array; NaN/inf/missing -> per-key default.
+    """
+    raw = [_pick(metrics, k, alias, d) for k, alias, d in _KEY_SPECS]
+    try:
+        vals = np.array(raw, dtype=np.float64)
+    except (TypeError, ValueError):
+        # non-numeric entry somewhere: fall back to per-element coercion
+        vals = np.array([_safe_float(v, d) for v, d in zip(raw, _DEFAULTS.tolist())], dtype=np.float64)
+    bad = ~np.isfinite(vals)
+    if bad.any():
+        vals[bad] = _DEFAULTS[bad]
+    return vals
+
+
+# ---- v10 configuration (built once at import, shared by every call) ----
+@dataclass(frozen=True, slots=True)
+class RewardConfig:
+    """
+    Weights and targets of reward v10, in one place.
 
-    - core: EQE unlocked by overlap & injection balance gates (multiplicative)
-    - reliability: explicitly penalize droop/leakage/auger and reward lifetime
-    - windows: brightness window avoids trivial low-V or extreme-V wins
-    - anti-cheat: boundary_penalty + eml_thin_penalty from env
-    - stable output: tanh(raw/scale) to avoid saturating at 10 too easily
+    Frozen and hashable: every distinct config gets its own compiled kernel
+    (see _kernel_for) with all fields baked in as compile-time constants.
     """
 
-    # --- base metrics ---
-    eqe = _safe_float(metrics.get("EQE", 0.0), 0.0)
-    overlap = _clamp(_safe_float(metrics.get("recomb_overlap", 0.0), 0.0), 0.0, 1.0)
-    balance = _clamp(_safe_float(metrics.get("inj_balance", 0.0), 0.0), 0.0, 1.0)
-    droop = _clamp(_safe_float(metrics.get("droop", 1.0), 1.0), 0.0, 1.0)
+    # multiplicative gates with floor
+    gate_floor: float = 0.25
+
+    # hinge targets
+    target_overlap: float = 0.45
+    target_balance: float = 0.40
+    droop_floor: float = 0.60
+    life_floor: float = 800.0
+    b_min: float = 700.0
+    b_max: float = 1800.0
+    v_high: float = 4.2
+
+    # log1p reference scales (x = ref -> ~1.0)
+    eqe_ref: float = 30.0
+    bri_ref: float = 1500.0
+    life_ref: float = 2000.0
+    leak_ref: float = 1.0
+    auger_ref: float = 1.0
+
+    # weights (tuned for your current failure mode: high V -> droop/auger/leak -> low life)
+    w_core: float = 3.0
+    w_helper: float = 1.0
+    w_pen: float = 1.2
+    w_jump: float = 0.10
+    w_bound: float = 1.2
+    w_eml_thin: float = 1.2
+    w_low_overlap: float = 3.0
+    w_low_balance: float = 1.5
+    w_low_droop: float = 4.0
+    w_low_life: float = 3.0
+    w_bri_window: float = 1.4
+    w_v_high: float = 0.4
+
+    # progress shaping gain and output squashing
+    w_delta: float = 0.18
+    tanh_scale: float = 3.2
+    reward_scale: float = 10.0
+    # rational tanh approximation for training rollouts (see _k_fast_tanh); off = exact tanh
+    fast_tanh: bool = False
+
+    @property
+    def weights(self) -> Dict[str, float]:
+        """Weights keyed as in the legacy _WEIGHTS dict."""
+        return {
+            "core": self.w_core,
+            "helper": self.w_helper,
+            "pen": self.w_pen,
+            "jump": self.w_jump,
+            "bound": self.w_bound,
+            "eml_thin": self.w_eml_thin,
+            "low_overlap": self.w_low_overlap,
+            "low_balance": self.w_low_balance,
+            "low_droop": self.w_low_droop,
+            "low_life": self.w_low_life,
+            "bri_window": self.w_bri_window,
+            "v_high": self.w_v_high,
+        }
+
+    @property
+    def hinge_table(self) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        """
+        (targets, scales) for the seven hinges, each max(0, (target - x) * scale) ** 2.
+        Order: overlap, balance, droop, lifetime, brightness low, brightness high, V_drive.
+        Upper-bound hinges use a negative scale.
+        """
+        targets = (
+            self.target_overlap, self.target_balance, self.droop_floor, self.life_floor,
+            self.b_min, self.b_max, self.v_high,
+        )
+        scales = (1.0, 1.0, 1.0, 1.0 / self.life_floor, 1.0 / self.b_min, -1.0 / self.b_max, -1.0 / self.v_high)
+        return targets, scales
+
+    @property
+    def inv_log1p_refs(self) -> Tuple[float, float, float, float, float]:
+        """1 / log1p(ref) for eqe, brightness, lifetime, leakage, auger."""
+        return tuple(
+            _INV_LOG1P.get(r) or 1.0 / math.log1p(r)
+            for r in (self.eqe_ref, self.bri_ref, self.life_ref, self.leak_ref, self.auger_ref)
+        )
+
+
+V10_CFG = RewardConfig()
+_DEFAULT_CFG = V10_CFG
+
+
+# fastmath without nnan/ninf: the kernel relies on isnan(U_prev) as the "no previous U" sentinel.
+# "contract" is what lets LLVM fuse the gate / helper / U chains into fma (vfmadd) instructions.
+_KERNEL_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(cache=True, inline="always")
+def _k_log1p_norm(x, inv_log1p_ref):
+    x = max(0.0, x)
+    return max(0.0, min(2.0, log1p(x) * inv_log1p_ref))
+
+
+@njit(cache=True, inline="always")
+def _k_fast_tanh(x):
+    """
+    Pade-style tanh: x * (27 + x^2) / (27 + 9 x^2), with x clamped to [-3, 3]
+    where it reaches exactly +-1. Monotone, |error| < 0.025; no exp call.
+    """
+    x = min(3.0, max(-3.0, x))
+    x2 = x * x
+    return x * (27.0 + x2) / (27.0 + 9.0 * x2)
+
+
+def _build_kernel(cfg: RewardConfig):
+    """Compile the v10 arithmetic with every cfg field closed over as a constant."""
+    gate_floor = cfg.gate_floor
+    gate_span = 1.0 - cfg.gate_floor
+    target_overlap, target_balance = cfg.target_overlap, cfg.target_balance
+    droop_floor, life_floor = cfg.droop_floor, cfg.life_floor
+    b_min, b_max, v_high = cfg.b_min, cfg.b_max, cfg.v_high
+    inv_eqe, inv_bri, inv_life, inv_leak, inv_auger = cfg.inv_log1p_refs
+    w_core, w_helper, w_pen, w_jump = cfg.w_core, cfg.w_helper, cfg.w_pen, cfg.w_jump
+    w_bound, w_eml_thin, w_v_high = cfg.w_bound, cfg.w_eml_thin, cfg.w_v_high
+    w_low_overlap, w_low_balance = cfg.w_low_overlap, cfg.w_low_balance
+    w_low_droop, w_low_life, w_bri_window = cfg.w_low_droop, cfg.w_low_life, cfg.w_bri_window
+    w_delta, tanh_scale, reward_scale = cfg.w_delta, cfg.tanh_scale, cfg.reward_scale
+    fast_tanh = cfg.fast_tanh
+
+    @njit(cache=True, fastmath=_KERNEL_FASTMATH, boundscheck=False)
+    def _reward_kernel(
+        eqe, overlap, balance, droop,
+        brightness, lifetime, leakage, auger,
+        metric_penalty, constraint_penalty, delta_params_norm,
+        boundary_penalty, eml_thin_penalty, V_drive,
+        U_prev,
+    ):
+        """
+        Pure-float v10 arithmetic (Numba-compiled when available).
+        Inputs must be finite and pre-clamped; U_prev is NaN when there is no previous step.
+        Takes and returns only floats, so the compiled path never boxes Python objects.
+        """
+        total_penalty = metric_penalty + constraint_penalty
+        pen_soft = log1p(max(0.0, total_penalty))
+        jump_pen = delta_params_norm ** 2
+
+        # --- shaping (good gradients near 0) ---
+        overlap_s = sqrt(overlap + 1e-8)
+        balance_s = sqrt(balance + 1e-8)
+        eqe_s = _k_log1p_norm(eqe, inv_eqe)
+
+        # multiplicative gates with floor (each gate is one fma)
+        core = eqe_s * (gate_floor + gate_span * overlap_s) * (gate_floor + gate_span * balance_s)
+
+        # normalized reliability terms
+        bri_s = _k_log1p_norm(brightness, inv_bri)
+        life_s = _k_log1p_norm(lifetime, inv_life)
+        leak_s = _k_log1p_norm(leakage, inv_leak)
+        auger_s = _k_log1p_norm(auger, inv_auger)
+
+        # --- helper dense reward (still useful) ---
+        # consumes the shaped terms right after they are produced: one fma chain
+        helper = (
+            0.55 * overlap_s
+            + 0.35 * balance_s
+            + 0.10 * bri_s
+            + 0.18 * life_s
+            - 0.25 * leak_s
+            - 0.25 * auger_s
+            + 0.03 * droop
+        )
+
+        # --- hinge targets (force good regions) ---
+        # overlap/balance not too low
+        low_overlap_pen = max(0.0, target_overlap - overlap) ** 2
+        low_balance_pen = max(0.0, target_balance - balance) ** 2
+
+        # droop floor: avoid winning by pushing V too high (droop collapse)
+        low_droop_pen = max(0.0, droop_floor - droop) ** 2
+
+        # lifetime floor: avoid "high EQE but dies fast"
+        low_life_pen = max(0.0, (life_floor - lifetime) / life_floor) ** 2
+
+        # brightness window: keep within a practical range
+        bri_low_pen = max(0.0, (b_min - brightness) / b_min) ** 2
+        bri_high_pen = max(0.0, (brightness - b_max) / b_max) ** 2
+
+        # mild high-V regularizer (optional safety rail)
+        v_high_pen = max(0.0, (V_drive - v_high) / v_high) ** 2
+
+        U = (
+            w_core * core
+            + w_helper * helper
+            - w_low_overlap * low_overlap_pen
+            - w_low_balance * low_balance_pen
+            - w_low_droop * low_droop_pen
+            - w_low_life * low_life_pen
+            - w_bri_window * (bri_low_pen + bri_high_pen)
+            - w_pen * pen_soft
+            - w_jump * jump_pen
+            - w_bound * boundary_penalty
+            - w_eml_thin * eml_thin_penalty
+            - w_v_high * v_high_pen
+        )
+
+        # progress shaping (small)
+        dU = 0.0
+        if not isnan(U_prev):
+            dU = U - U_prev
+
+        # tiny milestones (branchless: each comparison contributes 0 or its step)
+        bonus = 0.05 * (overlap > 0.70) + 0.03 * (balance > 0.80) + 0.05 * (lifetime > 900.0)
+
+        raw = U + w_delta * dU + bonus
+
+        # de-saturate: reduce "always near +10"
+        # (fast_tanh is a closure constant, so Numba compiles only one branch)
+        if fast_tanh:
+            reward = reward_scale * _k_fast_tanh(raw / tanh_scale)
+        else:
+            reward = reward_scale * tanh(raw / tanh_scale)
+
+        return (
+            reward, U, dU, bonus, raw,
+            eqe, overlap, balance, droop, brightness, leakage, auger, lifetime, V_drive,
+            delta_params_norm, boundary_penalty, eml_thin_penalty, pen_soft,
+            low_overlap_pen, low_balance_pen, low_droop_pen, low_life_pen, bri_low_pen, bri_high_pen,
+        )
+
+    return _reward_kernel
+
+
+_KERNELS: Dict[RewardConfig, Any] = {}
+
+
+def _kernel_for(cfg: RewardConfig):
+    kernel = _KERNELS.get(cfg)
+    if kernel is None:
+        kernel = _KERNELS[cfg] = _build_kernel(cfg)
+    return kernel
+
+
+_reward_kernel = _kernel_for(V10_CFG)
+
+
+def _build_batch_kernel(cfg: RewardConfig):
+    """
+    Row loop over RewardBatch columns calling the scalar kernel for `cfg`.
+    The scalar kernel is inlined by LLVM, so the unused breakdown terms are dropped.
+    """
+    kernel = _kernel_for(cfg)
 
-    brightness = _safe_float(metrics.get("brightness", 0.0), 0.0)
-    lifetime = _safe_float(metrics.get("lifetime", 0.0), 0.0)
-    leakage = _safe_float(metrics.get("leakage", 0.0), 0.0)
-    auger = _safe_float(metrics.get("auger_rate", metrics.get("auger", 0.0)), 0.0)
+    @njit(cache=True, parallel=True, fastmath=_KERNEL_FASTMATH, boundscheck=False)
+    def _reward_batch_kernel(
+        eqe, overlap, balance, droop,
+        brightness, lifetime, leakage, auger,
+        metric_penalty, constraint_penalty, delta_params_norm,
+        boundary_penalty, eml_thin_penalty, V_drive,
+        U_prev, out, U_out,
+    ):
+        for i in prange(out.shape[0]):
+            t = kernel(
+                eqe[i], overlap[i], balance[i], droop[i],
+                brightness[i], lifetime[i], leakage[i], auger[i],
+                metric_penalty[i], constraint_penalty[i], delta_params_norm[i],
+                boundary_penalty[i], eml_thin_penalty[i], V_drive[i],
+                U_prev[i],
+            )
+            out[i] = t[0]
+            U_out[i] = t[1]
+        return out
 
-    metric_penalty = _safe_float(metrics.get("penalty", 0.0), 0.0)
+    return _reward_batch_kernel
 
-    # shaping signals injected by env
-    U_prev = metrics.get("U_prev", None)
-    U_prev = None if U_prev is None else _safe_float(U_prev, None)
-    delta_params_norm = _safe_float(metrics.get("delta_params_norm", 0.0), 0.0)
 
-    boundary_penalty = _safe_float(metrics.get("boundary_penalty", 0.0), 0.0)
-    eml_thin_penalty = _safe_float(metrics.get("eml_thin_penalty", 0.0), 0.0)
-    V_drive = _safe_float(metrics.get("V_drive", 0.0), 0.0)
+_BATCH_KERNELS: Dict[RewardConfig, Any] = {}
+
+
+def _batch_kernel_for(cfg: RewardConfig):
+    kernel = _BATCH_KERNELS.get(cfg)
+    if kernel is None:
+        kernel = _BATCH_KERNELS[cfg] = _build_batch_kernel(cfg)
+    return kernel
+
+
+def _aggregate_violation_values(values, _safe=_safe_float) -> float:
+    total = 0.0
+    for v in values:
+        v = _safe(v, 0.0)
+        if v > 0.0:
+            total += v
+    return total
+
+
+def _aggregate_violation_dict(violation: Dict[str, Any]) -> float:
+    return _aggregate_violation_values(violation.values())
+
+
+def _aggregate_violation_scalar(violation: Any, _safe=_safe_float) -> float:
+    v = _safe(violation, 0.0)
+    return v if v > 0.0 else 0.0
+
+
+def _aggregate_violation(violation: Any) -> float:
+    """
+    Constraint penalty >= 0 from a per-constraint dict, a fixed-order tuple / array
+    (ParameterSpace.constraint_violation_values / constraint_violation_vec) or a scalar.
+    """
+    # exact-type checks first: the env passes a plain tuple (or dict) every step
+    if type(violation) is tuple:
+        return _aggregate_violation_values(violation)
+    if type(violation) is dict or isinstance(violation, dict):
+        return _aggregate_violation_dict(violation)
+    if isinstance(violation, np.ndarray) and violation.ndim > 0:
+        v = violation.astype(np.float64, copy=False)
+        return float(np.maximum(v[np.isfinite(v)], 0.0).sum())
+    if isinstance(violation, (tuple, list)):
+        return _aggregate_violation_values(violation)
+    return _aggregate_violation_scalar(violation)
+
+
+def _reward_terms(
+    metrics: Dict[str, Any],
+    violation: Any,
+    cfg: RewardConfig = _DEFAULT_CFG,
+    _gather=_gather_scalars,
+    _safe=_safe_float,
+    _max=max,
+    _min=min,
+    _nan=_NAN,
+) -> Tuple[float, ...]:
+    """
+    Numeric core of compute_reward; returns every term as a flat tuple
+    (see compute_reward for the order) so callers can skip the info dict.
+    """
+    # --- base metrics (+ shaping signals injected by env), NaN-guarded ---
+    (
+        eqe, overlap, balance, droop,
+        brightness, lifetime, leakage, auger,
+        metric_penalty, delta_params_norm,
+        boundary_penalty, eml_thin_penalty, V_drive,
+    ) = _gather(metrics)
+    # _clamp(x, 0.0, 1.0), inlined
+    overlap = _max(0.0, _min(1.0, overlap))
+    balance = _max(0.0, _min(1.0, balance))
+    droop = _max(0.0, _min(1.0, droop))
+
+    U_prev = metrics.get("U_prev", None)
+    U_prev = _nan if U_prev is None else _safe(U_prev, _nan)
 
     # --- constraint penalty aggregation ---
-    if isinstance(violation, dict):
-        constraint_penalty = sum(max(0.0, _safe_float(v, 0.0)) for v in violation.values())
-    else:
-        constraint_penalty = max(0.0, _safe_float(violation, 0.0))
+    constraint_penalty = _aggregate_violation(violation)
+
+    kernel = _reward_kernel if cfg is _DEFAULT_CFG else _kernel_for(cfg)
+    return kernel(
+        eqe, overlap, balance, droop,
+        brightness, lifetime, leakage, auger,
+        metric_penalty, constraint_penalty, delta_params_norm,
+        boundary_penalty, eml_thin_penalty, V_drive,
+        U_prev,
+    )
+
+
+@dataclass(slots=True)
+class RewardInfo:
+    """
+    Slotted reward breakdown; field order matches the _reward_terms tuple,
+    so it is built positionally without any dict inserts.
+    """
+
+    reward: float
+    U: float
+    dU: float
+    bonus: float
+    raw: float
+    eqe: float
+    overlap: float
+    inj_balance: float
+    droop: float
+    brightness: float
+    leakage: float
+    auger_rate: float
+    lifetime: float
+    V_drive: float
+    delta_params_norm: float
+    boundary_penalty: float
+    eml_thin_penalty: float
+    pen_soft: float
+    low_overlap_pen: float
+    low_balance_pen: float
+    low_droop_pen: float
+    low_life_pen: float
+    bri_low_pen: float
+    bri_high_pen: float
+
+    # constant hinge targets (default config): class-level, never copied per instance
+    target_overlap: ClassVar[float] = V10_CFG.target_overlap
+    target_balance: ClassVar[float] = V10_CFG.target_balance
+    droop_floor: ClassVar[float] = V10_CFG.droop_floor
+    life_floor: ClassVar[float] = V10_CFG.life_floor
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Legacy compute_reward info layout (flat scalars + nested "hinge")."""
+        return _info_dict(self)
+
+
+def compute_reward_info(
+    metrics: Dict[str, Any],
+    violation: Any = 0.0,
+    cfg: RewardConfig = _DEFAULT_CFG,
+) -> Tuple[float, RewardInfo]:
+    """Same as compute_reward, but the breakdown is a slotted RewardInfo instead of a dict."""
+    info = RewardInfo(*_reward_terms(metrics, violation, cfg))
+    return float(info.reward), info
+
+
+def compute_reward_scalar(
+    metrics: Dict[str, Any],
+    violation: Any = 0.0,
+    cfg: RewardConfig = _DEFAULT_CFG,
+) -> float:
+    """Same reward as compute_reward, without building the info dict (RL hot path)."""
+    return float(_reward_terms(metrics, violation, cfg)[0])
+
+
+def stack_metrics(metrics_seq) -> np.ndarray:
+    """Stack per-step metrics dicts into the (N, len(_KEYS)) array used by compute_reward_batch."""
+    rows = [_gather_metrics(m) for m in metrics_seq]
+    if not rows:
+        return np.zeros((0, len(_KEYS)), dtype=np.float64)
+    return np.stack(rows, axis=0)
+
+
+# log1p(ref) denominators for eqe, brightness, lifetime, leakage, auger (batch path)
+_INV_LOG1P_REFS = np.array(V10_CFG.inv_log1p_refs, dtype=np.float64)
+_HINGE_TARGETS, _HINGE_SCALES = (np.array(t, dtype=np.float64) for t in V10_CFG.hinge_table)
+
+
+def _hinge_sq(values: np.ndarray, targets: np.ndarray, scales: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    All hinge penalties max(0, (target - x) * scale) ** 2 in one pass over a (K, N) stack.
+    Branchless: subtract / multiply / maximum / square, each a single in-place ufunc over `out`.
+    """
+    out = np.subtract(targets[:, None], values, out=out)
+    out *= scales[:, None]
+    np.maximum(out, 0.0, out=out)
+    out *= out
+    return out
+
 
-    total_penalty = metric_penalty + constraint_penalty
-    pen_soft = math.log1p(max(0.0, total_penalty))
+@dataclass(slots=True)
+class RewardBatch:
+    """
+    Structure-of-arrays reward inputs for N steps, already sanitized:
+    finite, overlap/balance/droop clamped to [0, 1], violations aggregated,
+    U_prev NaN where there is no previous step. Every field is an (N,) array of
+    one float dtype: float64 by default, or float32 (dtype=np.float32) to halve
+    the bytes moved on large rollouts; rewards then agree with float64 to ~1e-5.
+    """
+
+    eqe: np.ndarray
+    overlap: np.ndarray
+    balance: np.ndarray
+    droop: np.ndarray
+    brightness: np.ndarray
+    lifetime: np.ndarray
+    leakage: np.ndarray
+    auger: np.ndarray
+    metric_penalty: np.ndarray
+    constraint_penalty: np.ndarray
+    delta_params_norm: np.ndarray
+    U_prev: np.ndarray
+    boundary_penalty: np.ndarray
+    eml_thin_penalty: np.ndarray
+    V_drive: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.eqe.shape[0])
+
+    @classmethod
+    def from_arrays(
+        cls,
+        metrics_arr: np.ndarray,
+        violation_arr: np.ndarray | None = None,
+        U_prev: np.ndarray | None = None,
+        dtype: Any = np.float64,
+    ) -> "RewardBatch":
+        """Build from an (N, K) _KEYS-ordered array (see compute_reward_batch for the args)."""
+        m = np.asarray(metrics_arr, dtype=dtype)
+        if m.ndim != 2 or m.shape[1] != len(_KEYS):
+            raise ValueError(f"metrics_arr must have shape (N, {len(_KEYS)}), got {m.shape}")
+        m = np.where(np.isfinite(m), m, _DEFAULTS.astype(m.dtype, copy=False))
+        n = m.shape[0]
+
+        (
+            eqe, overlap, balance, droop,
+            brightness, lifetime, leakage, auger,
+            metric_penalty, delta_params_norm,
+            boundary_penalty, eml_thin_penalty, V_drive,
+        ) = m.T
+
+        # --- constraint penalty aggregation ---
+        if violation_arr is None:
+            constraint_penalty = np.zeros(n, dtype=m.dtype)
+        else:
+            v = np.nan_to_num(np.asarray(violation_arr, dtype=m.dtype), nan=0.0, posinf=0.0, neginf=0.0)
+            v = np.maximum(0.0, v)
+            constraint_penalty = v.sum(axis=1) if v.ndim == 2 else np.broadcast_to(v, (n,))
+
+        if U_prev is None:
+            U_prev = np.full(n, np.nan, dtype=m.dtype)
+        else:
+            U_prev = np.asarray(U_prev, dtype=m.dtype)
+            U_prev = np.where(np.isfinite(U_prev), U_prev, np.nan)
+
+        return cls(
+            eqe=eqe,
+            overlap=np.clip(overlap, 0.0, 1.0),
+            balance=np.clip(balance, 0.0, 1.0),
+            droop=np.clip(droop, 0.0, 1.0),
+            brightness=brightness,
+            lifetime=lifetime,
+            leakage=leakage,
+            auger=auger,
+            metric_penalty=metric_penalty,
+            constraint_penalty=constraint_penalty,
+            delta_params_norm=delta_params_norm,
+            U_prev=U_prev,
+            boundary_penalty=boundary_penalty,
+            eml_thin_penalty=eml_thin_penalty,
+            V_drive=V_drive,
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Mapping[str, Any],
+        n: int,
+        violation_arr: np.ndarray | None = None,
+        U_prev: np.ndarray | None = None,
+        dtype: Any = np.float64,
+    ) -> "RewardBatch":
+        """
+        Build from per-metric columns ({key: (N,) array or scalar}, e.g. a batched
+        simulator's output). Missing / None keys take their default, as in compute_reward.
+        """
+        m = np.empty((n, len(_KEYS)), dtype=dtype)
+        for j, (k, alias, d) in enumerate(_KEY_SPECS):
+            col = columns.get(k, _MISSING)
+            if col is _MISSING and alias is not None:
+                col = columns.get(alias, _MISSING)
+            m[:, j] = d if col is _MISSING or col is None else col
+        return cls.from_arrays(m, violation_arr, U_prev, dtype)
+
+    @classmethod
+    def from_metrics(cls, metrics_seq, violations=None, dtype: Any = np.float64) -> "RewardBatch":
+        """Build from per-step metrics dicts (and optional per-step violations, dict or float)."""
+        metrics_seq = list(metrics_seq)
+        U_prev = []
+        for m in metrics_seq:
+            u = m.get("U_prev", None)
+            U_prev.append(math.nan if u is None else _safe_float(u, math.nan))
+        violation_arr = None
+        if violations is not None:
+            violation_arr = np.array([_aggregate_violation(v) for v in violations], dtype=np.float64)
+        return cls.from_arrays(stack_metrics(metrics_seq), violation_arr, np.array(U_prev, dtype=np.float64), dtype)
+
+
+def compute_reward_batch(
+    metrics_arr: np.ndarray | RewardBatch,
+    violation_arr: np.ndarray | None = None,
+    U_prev: np.ndarray | None = None,
+    cfg: RewardConfig = _DEFAULT_CFG,
+    dtype: Any = np.float64,
+    U_out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Vectorized reward v10 over a whole rollout.
+
+    Args:
+        metrics_arr: a RewardBatch, or an (N, K) array with columns ordered as _KEYS
+            (see stack_metrics)
+        violation_arr: (N,) aggregate or (N, M) per-constraint violations; None -> 0
+        U_prev: (N,) previous-step U, NaN where there is none; None -> no progress term
+        cfg: weights / targets (default: V10_CFG)
+        dtype: float dtype for an array input (np.float32 halves memory traffic);
+            a RewardBatch keeps its own dtype
+        U_out: optional (N,) array that receives each row's U (the next step's U_prev)
+
+    Returns:
+        (N,) rewards in the batch dtype, matching compute_reward row by row.
+
+    With numba the rows go through a parallel loop over the compiled scalar
+    kernel; otherwise through the NumPy implementation below.
+    """
+    if isinstance(metrics_arr, RewardBatch):
+        batch = metrics_arr
+    else:
+        batch = RewardBatch.from_arrays(metrics_arr, violation_arr, U_prev, dtype)
+
+    if NUMBA_AVAILABLE:
+        n = len(batch)
+        if U_out is None:
+            U_out = np.empty(n, dtype=batch.eqe.dtype)
+        # one compiled, multi-core pass over the rows (same arithmetic as compute_reward)
+        return _batch_kernel_for(cfg)(
+            batch.eqe, batch.overlap, batch.balance, batch.droop,
+            batch.brightness, batch.lifetime, batch.leakage, batch.auger,
+            batch.metric_penalty, batch.constraint_penalty, batch.delta_params_norm,
+            batch.boundary_penalty, batch.eml_thin_penalty, batch.V_drive,
+            batch.U_prev, np.empty(n, dtype=batch.eqe.dtype), U_out,
+        )
+    return _compute_reward_batch_numpy(batch, cfg, U_out)
+
+
+def _compute_reward_batch_numpy(
+    batch: RewardBatch,
+    cfg: RewardConfig,
+    U_out: np.ndarray | None = None,
+) -> np.ndarray:
+    """NumPy fallback for compute_reward_batch (no numba)."""
+    dtype = batch.eqe.dtype
+    eqe, overlap, balance, droop = batch.eqe, batch.overlap, batch.balance, batch.droop
+    brightness, lifetime, leakage, auger = batch.brightness, batch.lifetime, batch.leakage, batch.auger
+    metric_penalty, constraint_penalty = batch.metric_penalty, batch.constraint_penalty
+    delta_params_norm, U_prev = batch.delta_params_norm, batch.U_prev
+    boundary_penalty, eml_thin_penalty, V_drive = batch.boundary_penalty, batch.eml_thin_penalty, batch.V_drive
+
+    pen_soft = np.log1p(np.maximum(0.0, metric_penalty + constraint_penalty))
     jump_pen = delta_params_norm ** 2
 
-    # --- shaping (good gradients near 0) ---
-    overlap_s = math.sqrt(overlap + 1e-8)
-    balance_s = math.sqrt(balance + 1e-8)
-    eqe_s = _log1p_norm(eqe, ref=30.0)
+    # --- shaping + gates ---
+    gate_span = 1.0 - cfg.gate_floor
+    inv_refs = _INV_LOG1P_REFS if cfg is _DEFAULT_CFG else np.array(cfg.inv_log1p_refs, dtype=np.float64)
+    inv_refs = inv_refs.astype(dtype, copy=False)
+    overlap_s = np.sqrt(overlap + 1e-8)
+    balance_s = np.sqrt(balance + 1e-8)
+    # all five log1p normalizations in one ufunc call over a (5, N) stack
+    logs = np.log1p(np.maximum(0.0, np.stack([eqe, brightness, lifetime, leakage, auger])))
+    eqe_s, bri_s, life_s, leak_s, auger_s = np.clip(logs * inv_refs[:, None], 0.0, 2.0)
+    core = (
+        eqe_s
+        * (cfg.gate_floor + gate_span * overlap_s)
+        * (cfg.gate_floor + gate_span * balance_s)
+    )
+
+    # --- hinge targets: all seven in one (7, N) pass, in place over the stacked inputs ---
+    hinge_x = np.stack([overlap, balance, droop, lifetime, brightness, brightness, V_drive])
+    if cfg is _DEFAULT_CFG:
+        targets, scales = _HINGE_TARGETS, _HINGE_SCALES
+    else:
+        targets, scales = (np.array(t, dtype=np.float64) for t in cfg.hinge_table)
+    targets, scales = targets.astype(dtype, copy=False), scales.astype(dtype, copy=False)
+    (
+        low_overlap_pen, low_balance_pen, low_droop_pen, low_life_pen,
+        bri_low_pen, bri_high_pen, v_high_pen,
+    ) = _hinge_sq(hinge_x, targets, scales, out=hinge_x)
 
-    # multiplicative gates with floor
-    gate_floor = 0.25
-    gate_overlap = gate_floor + (1.0 - gate_floor) * overlap_s
-    gate_balance = gate_floor + (1.0 - gate_floor) * balance_s
-    core = eqe_s * gate_overlap * gate_balance
-
-    # normalized reliability terms
-    bri_s = _log1p_norm(brightness, ref=1500.0)
-    life_s = _log1p_norm(lifetime, ref=2000.0)
-    leak_s = _log1p_norm(leakage, ref=1.0)
-    auger_s = _log1p_norm(auger, ref=1.0)
-
-    # --- hinge targets (force good regions) ---
-    # overlap/balance not too low
-    target_overlap = 0.45
-    target_balance = 0.40
-    low_overlap_pen = max(0.0, target_overlap - overlap) ** 2
-    low_balance_pen = max(0.0, target_balance - balance) ** 2
-
-    # droop floor: avoid winning by pushing V too high (droop collapse)
-    droop_floor = 0.60
-    low_droop_pen = max(0.0, droop_floor - droop) ** 2
-
-    # lifetime floor: avoid "high EQE but dies fast"
-    life_floor = 800.0
-    low_life_pen = max(0.0, (life_floor - lifetime) / life_floor) ** 2
-
-    # brightness window: keep within a practical range
-    B_min, B_max = 700.0, 1800.0
-    bri_low_pen = max(0.0, (B_min - brightness) / B_min) ** 2
-    bri_high_pen = max(0.0, (brightness - B_max) / B_max) ** 2
-
-    # mild high-V regularizer (optional safety rail)
-    v_high = 4.2
-    v_high_pen = max(0.0, (V_drive - v_high) / v_high) ** 2
-
-    # --- helper dense reward (still useful) ---
     helper = (
         0.55 * overlap_s
         + 0.35 * balance_s
@@ -119,85 +805,104 @@ def compute_reward(metrics: Dict[str, Any], violation: Any = 0.0) -> Tuple[float
         + 0.03 * droop
     )
 
-    # --- weights (tuned for your current failure mode: high V -> droop/auger/leak -> low life) ---
-    w_core = 3.0
-    w_helper = 1.0
-    w_pen = 1.2
-    w_jump = 0.10
-    w_bound = 1.2
-    w_eml_thin = 1.2
-
-    w_low_overlap = 3.0
-    w_low_balance = 1.5
-    w_low_droop = 4.0
-    w_low_life = 3.0
-    w_bri_window = 1.4
-    w_v_high = 0.4
-
     U = (
-        w_core * core
-        + w_helper * helper
-        - w_low_overlap * low_overlap_pen
-        - w_low_balance * low_balance_pen
-        - w_low_droop * low_droop_pen
-        - w_low_life * low_life_pen
-        - w_bri_window * (bri_low_pen + bri_high_pen)
-        - w_pen * pen_soft
-        - w_jump * jump_pen
-        - w_bound * boundary_penalty
-        - w_eml_thin * eml_thin_penalty
-        - w_v_high * v_high_pen
+        cfg.w_core * core
+        + cfg.w_helper * helper
+        - cfg.w_low_overlap * low_overlap_pen
+        - cfg.w_low_balance * low_balance_pen
+        - cfg.w_low_droop * low_droop_pen
+        - cfg.w_low_life * low_life_pen
+        - cfg.w_bri_window * (bri_low_pen + bri_high_pen)
+        - cfg.w_pen * pen_soft
+        - cfg.w_jump * jump_pen
+        - cfg.w_bound * boundary_penalty
+        - cfg.w_eml_thin * eml_thin_penalty
+        - cfg.w_v_high * v_high_pen
     )
 
-    # progress shaping (small)
-    dU = 0.0
-    if U_prev is not None:
-        dU = U - U_prev
-
-    # tiny milestones
-    bonus = 0.0
-    if overlap > 0.70:
-        bonus += 0.05
-    if balance > 0.80:
-        bonus += 0.03
-    if lifetime > 900.0:
-        bonus += 0.05
-
-    raw = U + 0.18 * dU + bonus
-
-    # de-saturate: reduce "always near +10"
-    reward = 10.0 * math.tanh(raw / 3.2)
-
-    info = {
-        "U": U,
-        "dU": dU,
-        "bonus": bonus,
-        "raw": raw,
-        "reward": reward,
-        "eqe": eqe,
-        "overlap": overlap,
-        "inj_balance": balance,
-        "droop": droop,
-        "brightness": brightness,
-        "leakage": leakage,
-        "auger_rate": auger,
-        "lifetime": lifetime,
-        "V_drive": V_drive,
-        "delta_params_norm": delta_params_norm,
-        "boundary_penalty": boundary_penalty,
-        "eml_thin_penalty": eml_thin_penalty,
-        "pen_soft": pen_soft,
-        "hinge": {
-            "target_overlap": target_overlap,
-            "target_balance": target_balance,
-            "droop_floor": droop_floor,
-            "life_floor": life_floor,
-            "low_overlap_pen": low_overlap_pen,
-            "low_balance_pen": low_balance_pen,
-            "low_droop_pen": low_droop_pen,
-            "low_life_pen": low_life_pen,
-            "bri_low_pen": bri_low_pen,
-            "bri_high_pen": bri_high_pen,
-        },
-    }
-    return float(reward), info
+    if U_out is not None:
+        U_out[...] = U
+    dU = np.where(np.isnan(U_prev), 0.0, U - U_prev)
+
+    # bool masks cast to the batch dtype so float32 batches stay float32
+    bonus = (
+        0.05 * (overlap > 0.70).astype(dtype)
+        + 0.03 * (balance > 0.80).astype(dtype)
+        + 0.05 * (lifetime > 900.0).astype(dtype)
+    )
+
+    raw = U + cfg.w_delta * dU + bonus
+    x = raw / cfg.tanh_scale
+    if cfg.fast_tanh:
+        np.clip(x, -3.0, 3.0, out=x)
+        x2 = x * x
+        return cfg.reward_scale * (x * (27.0 + x2) / (27.0 + 9.0 * x2))
+    return cfg.reward_scale * np.tanh(x)
+
+
+# Shared read-only info returned by compute_reward(..., log_info=False).
+_EMPTY_INFO: Mapping[str, Any] = MappingProxyType({})
+
+def compute_reward(
+    metrics: Dict[str, Any],
+    violation: Any = 0.0,
+    *,
+    log_info: bool = True,
+    cfg: RewardConfig = _DEFAULT_CFG,
+) -> Tuple[float, Dict[str, Any]]:
+    """
+    Reward v10: Efficiency + Reliability + Anti-cheat (boundaries & low-V tricks)
+
+    - core: EQE unlocked by overlap & injection balance gates (multiplicative)
+    - reliability: explicitly penalize droop/leakage/auger and reward lifetime
+    - windows: brightness window avoids trivial low-V or extreme-V wins
+    - anti-cheat: boundary_penalty + eml_thin_penalty from env
+    - stable output: tanh(raw/scale) to avoid saturating at 10 too easily
+
+    With log_info=False no breakdown is built and info is the shared empty
+    mapping _EMPTY_INFO (use compute_reward_info if you need U without the dict).
+    `cfg` selects weights / targets (default: V10_CFG).
+    """
+    if not log_info:
+        return compute_reward_scalar(metrics, violation, cfg), _EMPTY_INFO
+    reward, info = compute_reward_info(metrics, violation, cfg)
+    return reward, _info_dict(info, cfg)
+
+
+def _info_dict(terms: RewardInfo, cfg: RewardConfig = _DEFAULT_CFG) -> Dict[str, Any]:
+    """Expand a RewardInfo into the compute_reward info dict."""
+    info: Dict[str, Any] = {}
+    hinge: Dict[str, Any] = {}
+
+    info["U"] = terms.U
+    info["dU"] = terms.dU
+    info["bonus"] = terms.bonus
+    info["raw"] = terms.raw
+    info["reward"] = terms.reward
+    info["eqe"] = terms.eqe
+    info["overlap"] = terms.overlap
+    info["inj_balance"] = terms.inj_balance
+    info["droop"] = terms.droop
+    info["brightness"] = terms.brightness
+    info["leakage"] = terms.leakage
+    info["auger_rate"] = terms.auger_rate
+    info["lifetime"] = terms.lifetime
+    info["V_drive"] = terms.V_drive
+    info["delta_params_norm"] = terms.delta_params_norm
+    info["boundary_penalty"] = terms.boundary_penalty
+    info["eml_thin_penalty"] = terms.eml_thin_penalty
+    info["pen_soft"] = terms.pen_soft
+
+    hinge["target_overlap"] = cfg.target_overlap
+    hinge["target_balance"] = cfg.target_balance
+    hinge["droop_floor"] = cfg.droop_floor
+    hinge["life_floor"] = cfg.life_floor
+    hinge["low_overlap_pen"] = terms.low_overlap_pen
+    hinge["low_balance_pen"] = terms.low_balance_pen
+    hinge["low_droop_pen"] = terms.low_droop_pen
+    hinge["low_life_pen"] = terms.low_life_pen
+    hinge["bri_low_pen"] = terms.bri_low_pen
+    hinge["bri_high_pen"] = terms.bri_high_pen
+    info["hinge"] = hinge
+
+    return info
@@ -0,0 +1,132 @@
+"""
+JAX port of reward v10, for env loops that are jitted / pmapped end to end.
+
+Same formula as reward_function.compute_reward_batch, written with jax.numpy
+elementwise ops and jnp.where only, so it traces into the jitted step and no
+host callback is needed. The RewardConfig is a static argument (frozen, hashable),
+so its weights fold into the compiled program as constants. jax is imported here
+only; the rest of qled_env does not require it.
+"""
+from __future__ import annotations
+
+from functools import partial
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from .reward_function import _KEYS, _DEFAULTS, RewardConfig, V10_CFG
+
+# column indices into the (..., K) metrics array (same order as reward_function._KEYS)
+(
+    EQE, OVERLAP, BALANCE, DROOP,
+    BRIGHTNESS, LIFETIME, LEAKAGE, AUGER,
+    PENALTY, DELTA_PARAMS_NORM,
+    BOUNDARY_PENALTY, EML_THIN_PENALTY, V_DRIVE,
+) = range(len(_KEYS))
+
+
+@partial(jax.jit, static_argnames=("cfg",))
+def compute_reward_jax(
+    metrics: jax.Array,
+    constraint_penalty: jax.Array | None = None,
+    U_prev: jax.Array | None = None,
+    cfg: RewardConfig = V10_CFG,
+) -> jax.Array:
+    """
+    Reward v10 over the leading dims of `metrics`.
+
+    Args:
+        metrics: (..., K) array, columns as reward_function._KEYS (a single step is (K,))
+        constraint_penalty: (...,) aggregated constraint violation (>= 0), or None
+        U_prev: (...,) previous-step U, NaN where there is none, or None
+        cfg: weights / targets, static (default: V10_CFG)
+
+    Returns:
+        (...,) rewards in the dtype of `metrics`.
+    """
+    m = jnp.asarray(metrics)
+    if not jnp.issubdtype(m.dtype, jnp.floating):
+        m = m.astype(jnp.float32)
+    dtype = m.dtype
+    m = jnp.where(jnp.isfinite(m), m, jnp.asarray(_DEFAULTS, dtype=dtype))
+
+    overlap = jnp.clip(m[..., OVERLAP], 0.0, 1.0)
+    balance = jnp.clip(m[..., BALANCE], 0.0, 1.0)
+    droop = jnp.clip(m[..., DROOP], 0.0, 1.0)
+    brightness = m[..., BRIGHTNESS]
+    lifetime = m[..., LIFETIME]
+    V_drive = m[..., V_DRIVE]
+    delta = m[..., DELTA_PARAMS_NORM]
+
+    total_penalty = m[..., PENALTY]
+    if constraint_penalty is not None:
+        total_penalty = total_penalty + jnp.maximum(0.0, jnp.asarray(constraint_penalty, dtype=dtype))
+    pen_soft = jnp.log1p(jnp.maximum(0.0, total_penalty))
+
+    overlap_s = jnp.sqrt(overlap + 1e-8)
+    balance_s = jnp.sqrt(balance + 1e-8)
+
+    logs = jnp.log1p(jnp.maximum(0.0, m[..., [EQE, BRIGHTNESS, LIFETIME, LEAKAGE, AUGER]]))
+    norm = jnp.clip(logs * jnp.asarray(np.array(cfg.inv_log1p_refs), dtype=dtype), 0.0, 2.0)
+    eqe_s, bri_s, life_s, leak_s, auger_s = (norm[..., i] for i in range(5))
+
+    gate_span = 1.0 - cfg.gate_floor
+    core = (
+        eqe_s
+        * (cfg.gate_floor + gate_span * overlap_s)
+        * (cfg.gate_floor + gate_span * balance_s)
+    )
+
+    low_overlap_pen = jnp.maximum(0.0, cfg.target_overlap - overlap) ** 2
+    low_balance_pen = jnp.maximum(0.0, cfg.target_balance - balance) ** 2
+    low_droop_pen = jnp.maximum(0.0, cfg.droop_floor - droop) ** 2
+    low_life_pen = jnp.maximum(0.0, (cfg.life_floor - lifetime) / cfg.life_floor) ** 2
+    bri_low_pen = jnp.maximum(0.0, (cfg.b_min - brightness) / cfg.b_min) ** 2
+    bri_high_pen = jnp.maximum(0.0, (brightness - cfg.b_max) / cfg.b_max) ** 2
+    v_high_pen = jnp.maximum(0.0, (V_drive - cfg.v_high) / cfg.v_high) ** 2
+
+    helper = (
+        0.55 * overlap_s
+        + 0.35 * balance_s
+        + 0.10 * bri_s
+        + 0.18 * life_s
+        - 0.25 * leak_s
+        - 0.25 * auger_s
+        + 0.03 * droop
+    )
+
+    U = (
+        cfg.w_core * core
+        + cfg.w_helper * helper
+        - cfg.w_low_overlap * low_overlap_pen
+        - cfg.w_low_balance * low_balance_pen
+        - cfg.w_low_droop * low_droop_pen
+        - cfg.w_low_life * low_life_pen
+        - cfg.w_bri_window * (bri_low_pen + bri_high_pen)
+        - cfg.w_pen * pen_soft
+        - cfg.w_jump * delta ** 2
+        - cfg.w_bound * m[..., BOUNDARY_PENALTY]
+        - cfg.w_eml_thin * m[..., EML_THIN_PENALTY]
+        - cfg.w_v_high * v_high_pen
+    )
+
+    if U_prev is None:
+        dU = jnp.zeros_like(U)
+    else:
+        U_prev = jnp.asarray(U_prev, dtype=dtype)
+        dU = jnp.where(jnp.isnan(U_prev), 0.0, U - U_prev)
+
+    bonus = (
+        0.05 * (overlap > 0.70).astype(dtype)
+        + 0.03 * (balance > 0.80).astype(dtype)
+        + 0.05 * (lifetime > 900.0).astype(dtype)
+    )
+
+    raw = U + cfg.w_delta * dU + bonus
+    x = raw / cfg.tanh_scale
+    if cfg.fast_tanh:
+        x = jnp.clip(x, -3.0, 3.0)
+        x2 = x * x
+        return cfg.reward_scale * (x * (27.0 + x2) / (27.0 + 9.0 * x2))
+    return cfg.reward_scale * jnp.tanh(x)
@@ -0,0 +1,147 @@
+"""
+Torch port of reward v10 for PyTorch RL stacks (rollouts kept as tensors, CPU or GPU).
+
+Same formula as reward_function.compute_reward_batch, written with elementwise
+torch ops and torch.where only (no Python branching on tensor values), so
+torch.compile can fuse it into a couple of kernels. torch is imported here only;
+the rest of qled_env does not require it.
+"""
+from __future__ import annotations
+
+import math
+
+import torch
+import torch.nn as nn
+
+from .reward_function import _KEYS, _DEFAULTS, RewardConfig, V10_CFG
+
+# column indices into the (B, K) metrics tensor (same order as reward_function._KEYS)
+(
+    EQE, OVERLAP, BALANCE, DROOP,
+    BRIGHTNESS, LIFETIME, LEAKAGE, AUGER,
+    PENALTY, DELTA_PARAMS_NORM,
+    BOUNDARY_PENALTY, EML_THIN_PENALTY, V_DRIVE,
+) = range(len(_KEYS))
+
+
+class RewardV10(nn.Module):
+    """
+    forward(metrics, constraint_penalty=None, U_prev=None) -> (B,) rewards
+
+    Weights / targets come from `cfg` (default: reward_function.V10_CFG).
+
+    Args:
+        metrics: (B, K) tensor, columns as reward_function._KEYS
+        constraint_penalty: (B,) aggregated constraint violation (>= 0), or None
+        U_prev: (B,) previous-step U, NaN where there is none, or None
+    """
+
+    def __init__(self, cfg: RewardConfig = V10_CFG):
+        super().__init__()
+        self.register_buffer("defaults", torch.tensor(_DEFAULTS, dtype=torch.float32))
+        refs = (cfg.eqe_ref, cfg.bri_ref, cfg.life_ref, cfg.leak_ref, cfg.auger_ref)
+        self.register_buffer(
+            "log1p_refs",
+            torch.tensor([math.log1p(r) for r in refs], dtype=torch.float32),
+        )
+        # plain floats (frozen cfg): torch.compile treats them as constants and folds them
+        self.cfg = cfg
+        self.w = cfg.weights
+
+    def forward(
+        self,
+        metrics: torch.Tensor,
+        constraint_penalty: torch.Tensor | None = None,
+        U_prev: torch.Tensor | None = None,
+    ) -> torch.Tensor:
+        w = self.w
+        c = self.cfg
+        m = metrics.to(self.defaults.dtype)
+        m = torch.where(torch.isfinite(m), m, self.defaults)
+
+        overlap = m[:, OVERLAP].clamp(0.0, 1.0)
+        balance = m[:, BALANCE].clamp(0.0, 1.0)
+        droop = m[:, DROOP].clamp(0.0, 1.0)
+        brightness = m[:, BRIGHTNESS]
+        lifetime = m[:, LIFETIME]
+        V_drive = m[:, V_DRIVE]
+        delta = m[:, DELTA_PARAMS_NORM]
+
+        total_penalty = m[:, PENALTY]
+        if constraint_penalty is not None:
+            total_penalty = total_penalty + constraint_penalty.to(m.dtype).clamp_min(0.0)
+        pen_soft = total_penalty.clamp_min(0.0).log1p()
+
+        overlap_s = (overlap + 1e-8).sqrt()
+        balance_s = (balance + 1e-8).sqrt()
+
+        logs = m[:, [EQE, BRIGHTNESS, LIFETIME, LEAKAGE, AUGER]].clamp_min(0.0).log1p()
+        norm = (logs / self.log1p_refs).clamp(0.0, 2.0)
+        eqe_s, bri_s, life_s, leak_s, auger_s = norm.unbind(dim=1)
+
+        core = (
+            eqe_s
+            * (c.gate_floor + (1.0 - c.gate_floor) * overlap_s)
+            * (c.gate_floor + (1.0 - c.gate_floor) * balance_s)
+        )
+
+        low_overlap_pen = (c.target_overlap - overlap).clamp_min(0.0) ** 2
+        low_balance_pen = (c.target_balance - balance).clamp_min(0.0) ** 2
+        low_droop_pen = (c.droop_floor - droop).clamp_min(0.0) ** 2
+        low_life_pen = ((c.life_floor - lifetime) / c.life_floor).clamp_min(0.0) ** 2
+        bri_low_pen = ((c.b_min - brightness) / c.b_min).clamp_min(0.0) ** 2
+        bri_high_pen = ((brightness - c.b_max) / c.b_max).clamp_min(0.0) ** 2
+        v_high_pen = ((V_drive - c.v_high) / c.v_high).clamp_min(0.0) ** 2
+
+        helper = (
+            0.55 * overlap_s
+            + 0.35 * balance_s
+            + 0.10 * bri_s
+            + 0.18 * life_s
+            - 0.25 * leak_s
+            - 0.25 * auger_s
+            + 0.03 * droop
+        )
+
+        U = (
+            w["core"] * core
+            + w["helper"] * helper
+            - w["low_overlap"] * low_overlap_pen
+            - w["low_balance"] * low_balance_pen
+            - w["low_droop"] * low_droop_pen
+            - w["low_life"] * low_life_pen
+            - w["bri_window"] * (bri_low_pen + bri_high_pen)
+            - w["pen"] * pen_soft
+            - w["jump"] * delta ** 2
+            - w["bound"] * m[:, BOUNDARY_PENALTY]
+            - w["eml_thin"] * m[:, EML_THIN_PENALTY]
+            - w["v_high"] * v_high_pen
+        )
+
+        if U_prev is None:
+            dU = torch.zeros_like(U)
+        else:
+            U_prev = U_prev.to(U.dtype)
+            dU = torch.where(torch.isnan(U_prev), torch.zeros_like(U), U - U_prev)
+
+        bonus = (
+            0.05 * (overlap > 0.70).to(U.dtype)
+            + 0.03 * (balance > 0.80).to(U.dtype)
+            + 0.05 * (lifetime > 900.0).to(U.dtype)
+        )
+
+        raw = U + c.w_delta * dU + bonus
+        x = raw / c.tanh_scale
+        if c.fast_tanh:
+            x = x.clamp(-3.0, 3.0)
+            x2 = x * x
+            return c.reward_scale * (x * (27.0 + x2) / (27.0 + 9.0 * x2))
+        return c.reward_scale * torch.tanh(x)
+
+
+def compiled_reward_v10(cfg: RewardConfig = V10_CFG) -> nn.Module:
+    """RewardV10 wrapped in torch.compile(fullgraph=True, dynamic=False) when available."""
+    module = RewardV10(cfg)
+    if hasattr(torch, "compile"):
+        return torch.compile(module, fullgraph=True, dynamic=False)
+    return module
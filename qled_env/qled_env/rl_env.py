@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import math
+
 import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
 
 from .parameter_space import ParameterSpace
-from .reward_function import compute_reward
+from .reward_function import compute_reward_info
 from .simulator_interface import SimulatorInterface
 
 
@@ -20,6 +22,7 @@ class QLEDRLEnv(gym.Env):
         action_scale: float = 0.05,
         include_metrics_in_obs: bool = False,
         seed: int | None = None,
+        log_reward_info: bool = True,
     ):
         super().__init__()
         self.simulator = simulator
@@ -27,6 +30,9 @@ class QLEDRLEnv(gym.Env):
         self.max_steps = int(max_steps)
         self.action_scale = float(action_scale)
         self.include_metrics_in_obs = bool(include_metrics_in_obs)
+        # False (training loops): no reward breakdown in step info, and info["violation"]
+        # is the constraint_names-ordered tuple instead of a dict
+        self.log_reward_info = bool(log_reward_info)
 
         self.rng = np.random.default_rng(seed)
 
@@ -37,6 +43,7 @@ class QLEDRLEnv(gym.Env):
         self.observation_space = spaces.Box(
             low=-1.0, high=1.0, shape=(obs_dim,), dtype=np.float32
         )
+        self._obs_dim = obs_dim
         self.action_space = spaces.Box(
             low=-1.0, high=1.0, shape=(self.ps.dim,), dtype=np.float32
         )
@@ -44,6 +51,11 @@ class QLEDRLEnv(gym.Env):
         self.step_count = 0
         self.x = None
         self.last_metrics = None
+        # physical-parameter vector, rewritten in place each step (ordered as ps.names)
+        self._x_real = np.empty(self.ps.dim, dtype=np.float64)
+        self._action_buf = np.empty(self.ps.dim, dtype=np.float32)
+        self._eml_col = self.ps.idx.get("t_EML_nm")
+        self._v_col = self.ps.idx.get("V_drive")
 
         # shaping memory
         self._U_prev = None
@@ -52,7 +64,9 @@ class QLEDRLEnv(gym.Env):
     def reset(self, *, seed=None, options=None):
         super().reset(seed=seed)
         if seed is not None:
-            self.rng = np.random.default_rng(seed)
+            # gymnasium just seeded np_random as Generator(PCG64(seed)), the same stream
+            # default_rng(seed) gives; reuse it instead of building a second generator
+            self.rng = self.np_random
 
         self.step_count = 0
 
@@ -66,7 +80,10 @@ class QLEDRLEnv(gym.Env):
         self.last_metrics = self.simulator.evaluate(params_real)
 
         self._U_prev = None
-        self._prev_x = self.x.copy()
+        if self._prev_x is None:
+            self._prev_x = self.x.copy()
+        else:
+            self._prev_x[:] = self.x  # keep the step() double buffer
 
         obs = self._build_obs(self.x, self.last_metrics)
         info = {"params": params_real, "metrics": self.last_metrics}
@@ -75,36 +92,43 @@ class QLEDRLEnv(gym.Env):
     def step(self, action):
         self.step_count += 1
 
-        prev_x = None if self._prev_x is None else self._prev_x.copy()
         U_prev = self._U_prev
 
-        action = np.asarray(action, dtype=np.float32)
-        action = np.clip(action, -1.0, 1.0)
+        # asarray is a no-op for the float32 arrays policies emit; clip into a reused buffer
+        action = np.clip(np.asarray(action, dtype=np.float32), -1.0, 1.0, out=self._action_buf)
 
-        self.x = self.x + self.action_scale * action
-        self.x = np.clip(self.x, -1.0, 1.0)
+        # double buffer: the new point is written into the _prev_x buffer and the two
+        # are swapped, so _prev_x ends up as the pre-step point (delta_params_norm base)
+        prev_x = self.x
+        x_new = self._prev_x
+        np.multiply(action, self.action_scale, out=x_new)
+        x_new += prev_x
+        np.clip(x_new, -1.0, 1.0, out=x_new)
+        self.x, self._prev_x = x_new, prev_x
 
-        params_real = self.ps.to_real(self.x)
+        x_real = self.ps.to_real_vec(self.x, out=self._x_real)
+        x_list = x_real.tolist()
+        params_real = dict(zip(self.ps.names, x_list))
 
-        violation = self.ps.constraint_violation(params_real)
-        metrics = self.simulator.evaluate(params_real)
+        # fixed-order tuple (self.ps.constraint_names); no per-step dict on the reward path
+        violation_values = self.ps.constraint_violation_values(x_list)
+        # the simulator reads the vector positionally; params_real is for info only
+        metrics = self.simulator.evaluate_array(x_real, self.ps.names)
 
         # delta_params_norm in normalized space
-        try:
-            if prev_x is None:
-                delta_params_norm = float(np.linalg.norm(self.x))
-            else:
-                delta_params_norm = float(np.linalg.norm(self.x - prev_x))
-        except Exception:
-            delta_params_norm = float(np.linalg.norm(action) * self.action_scale)
+        # sqrt of a dot product: np.linalg.norm's dispatch costs more than the math here
+        d = x_new - prev_x
+        delta_params_norm = math.sqrt(float(d.dot(d)))
 
         # stronger boundary penalty (4th power makes edges expensive)
         margin = 0.88
         excess = np.maximum(0.0, np.abs(self.x) - margin) / (1.0 - margin)
-        boundary_penalty = float(np.mean(excess ** 4))
+        excess *= excess  # excess**4 as two squarings, not the generic pow path
+        excess *= excess
+        boundary_penalty = float(np.mean(excess))
 
         # EML thin penalty (engineering prior): thin EML often increases leakage/quenching
-        t_eml = float(params_real.get("t_EML_nm", 0.0))
+        t_eml = x_list[self._eml_col] if self._eml_col is not None else 0.0
         eml_floor = 15.0
         eml_thin_penalty = float(max(0.0, (eml_floor - t_eml) / eml_floor) ** 2)
 
@@ -113,34 +137,48 @@ class QLEDRLEnv(gym.Env):
         metrics["delta_params_norm"] = delta_params_norm
         metrics["boundary_penalty"] = boundary_penalty
         metrics["eml_thin_penalty"] = eml_thin_penalty
-        metrics["V_drive"] = float(params_real.get("V_drive", 0.0))
+        metrics["V_drive"] = x_list[self._v_col] if self._v_col is not None else 0.0
 
-        reward, reward_info = compute_reward(metrics, violation)
+        reward, reward_terms = compute_reward_info(metrics, violation_values)
 
         terminated = False
         truncated = self.step_count >= self.max_steps
 
-        if self.ps.is_hard_invalid(violation):
+        if self.ps.is_hard_invalid(violation_values):
             terminated = True
 
         self.last_metrics = metrics
 
         # update shaping memory
-        self._U_prev = reward_info.get("U", self._U_prev)
-        self._prev_x = self.x.copy()
+        self._U_prev = reward_terms.U
 
         obs = self._build_obs(self.x, metrics)
+        if self.log_reward_info:
+            violation = dict(zip(self.ps.constraint_names, violation_values))
+        else:
+            violation = violation_values
+        # info always carries a plain dict (JSON / Monitor logging), whatever mapping
+        # type the simulator returned for the reward path
+        to_info_dict = getattr(metrics, "to_info_dict", None)
         info = {
             "params": params_real,
-            "metrics": metrics,
+            "metrics": metrics if to_info_dict is None else to_info_dict(),
             "violation": violation,
-            **reward_info,
         }
+        if self.log_reward_info:
+            info.update(reward_terms.as_dict())
         return obs, reward, terminated, truncated, info
 
     def _build_obs(self, x_norm, metrics):
-        x = x_norm.astype(np.float32)
-        if not self.include_metrics_in_obs:
-            return x
-        m = self.ps.metrics_to_vec(metrics).astype(np.float32)
-        return np.concatenate([x, m], axis=0)
+        """
+        Fresh observation array, filled by slices (no concatenate).
+
+        Each call returns a new array, so callers may store observations (replay
+        buffers, rollout lists) without copying them.
+        """
+        obs = np.empty(self._obs_dim, dtype=np.float32)
+        d = self.ps.dim
+        obs[:d] = x_norm
+        if self.include_metrics_in_obs:
+            self.ps.metrics_to_vec(metrics, out=obs[d:])
+        return obs
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Sequence
+
+import numpy as np
 
 
 class SimulatorInterface:
@@ -26,3 +28,34 @@ class SimulatorInterface:
               }
         """
         raise NotImplementedError("SimulatorInterface.evaluate() must be implemented")
+
+    def evaluate_array(self, x_real: np.ndarray, names: Sequence[str]) -> Dict[str, Any]:
+        """
+        evaluate() for a (dim,) real-parameter vector whose entries are named by
+        `names` (e.g. ParameterSpace.to_real_vec output and ParameterSpace.names).
+
+        The default builds the dict and calls evaluate(); simulators that can read
+        the vector positionally should override it.
+        """
+        return self.evaluate(dict(zip(names, np.asarray(x_real, dtype=np.float64).tolist())))
+
+    def evaluate_batch(self, params: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Batched evaluate for BatchQLEDRLEnv.
+
+        Args:
+            params: {name: (N,) array} real-parameter columns
+
+        Returns:
+            {metric: (N,) float64 array}. The default loops over evaluate() and
+            stacks the scalar metrics (keys of the first row); simulators with a
+            vectorized model should override it.
+        """
+        names = list(params)
+        cols = [np.asarray(params[k], dtype=np.float64).tolist() for k in names]
+        rows = [self.evaluate(dict(zip(names, vals))) for vals in zip(*cols)]
+        if not rows:
+            return {}
+        # scalar metrics only (e.g. COMSOL maps are dropped)
+        keys = [k for k, v in rows[0].items() if isinstance(v, (int, float, np.number))]
+        return {k: np.array([r.get(k, np.nan) for r in rows], dtype=np.float64) for k in keys}
@@ -0,0 +1,154 @@
+"""
+JAX port of the v3 SurrogateSim model, for rollouts of thousands of envs on an accelerator.
+
+Same formula as surrogate_sim._evaluate_core / SurrogateSim.evaluate_batch, written
+with jax.numpy elementwise ops, so it has no data-dependent control flow: it works
+over any leading batch dims as is, and composes with jax.vmap / reward_jax inside a
+larger jitted step. jax is imported here only; the rest of qled_env does not require it.
+
+Moving the batch to the device and back costs more than the NumPy model itself for
+small batches; SurrogateSimJAX only pays off for large N (roughly N >= 256 on a GPU).
+"""
+from __future__ import annotations
+
+from typing import Dict
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from .surrogate_sim import (
+    _METRIC_KEYS,
+    _AUGER_NORM,
+    _BRIGHT_NORM,
+    _EML_CENTER,
+    _EML_FLOOR,
+    _EML_FLOOR_INV,
+    _INV_2SIG2_EML,
+    _INV_2SIG2_GAP,
+    _INV_2SIG2_MIE,
+    _INV_2SIG2_SL,
+    _INV_BARRIER,
+    _INV_EQE_SAT,
+    _INV_FF_FULL,
+    _INV_V_SAT,
+    SurrogateSim,
+)
+
+# column indices into the (..., 13) params array (ParameterSpace / SurrogateSim.PARAM_NAMES order)
+(
+    T_HTL, T_EML, T_ETL,
+    PHI_HTL, PHI_ETL,
+    P_DOPING, N_DOPING,
+    PS_RADIUS, PS_FILL, SL_THICKNESS, SL_GAP, QD_COVERAGE,
+    V_DRIVE,
+) = range(len(SurrogateSim.PARAM_NAMES))
+
+
+@jax.jit
+def evaluate_jax(params: jax.Array) -> jax.Array:
+    """
+    v3 surrogate over the leading dims of `params`.
+
+    Args:
+        params: (..., 13) real parameters, columns as SurrogateSim.PARAM_NAMES
+
+    Returns:
+        (..., 10) metrics, columns as surrogate_sim._METRIC_KEYS, in the dtype of `params`.
+    """
+    p = jnp.asarray(params)
+    if not jnp.issubdtype(p.dtype, jnp.floating):
+        p = p.astype(jnp.float32)
+
+    t_eml = p[..., T_EML]
+    phi_h = p[..., PHI_HTL]
+    phi_e = p[..., PHI_ETL]
+    p_d = p[..., P_DOPING]
+    n_d = p[..., N_DOPING]
+    ps_r = p[..., PS_RADIUS]
+    ps_ff = p[..., PS_FILL]
+    sl_t = p[..., SL_THICKNESS]
+    sl_gap = p[..., SL_GAP]
+    qd_cov = p[..., QD_COVERAGE]
+    V = p[..., V_DRIVE]
+
+    # injection balance proxy
+    barrier_mismatch = jnp.abs((phi_h - 5.2) - (4.1 - phi_e))
+    inj_balance = jnp.exp(-(barrier_mismatch ** 2) * _INV_BARRIER)
+    inj_boost = jax.nn.sigmoid(8.0 * (p_d + n_d - 0.15))
+
+    # recombination overlap (narrower peak)
+    overlap = jnp.exp(-((t_eml - _EML_CENTER) ** 2) * _INV_2SIG2_EML)
+
+    # outcoupling proxies
+    mie_gain = 1.0 + 0.6 * jnp.exp(-((ps_r - 120.0) ** 2) * _INV_2SIG2_MIE)
+    cov_gain = 1.0 + 0.7 * jnp.clip(ps_ff * _INV_FF_FULL, 0.0, 1.0)
+    sl_gain = 1.0 + 0.4 * jnp.exp(-((sl_t - 15.0) ** 2) * _INV_2SIG2_SL)
+    gap_gain = 1.0 + 0.3 * jnp.exp(-((sl_gap - 1.2) ** 2) * _INV_2SIG2_GAP)
+    qd_gain = 0.6 + 0.4 * qd_cov
+    outcoupling = mie_gain * cov_gain * sl_gain * gap_gain * qd_gain
+
+    # V_drive terms, computed once: turn-on above 2.2 V, auger / lifetime above 3 V
+    dV22 = jnp.maximum(0.0, V - 2.2)
+    dV30 = jnp.maximum(0.0, V - 3.0)
+    dV30_sq = dV30 * dV30
+
+    # brightness driven by V (saturating), boosted by overlap & injection
+    V_term = -jnp.expm1(-dV22 * _INV_V_SAT)
+    brightness = 250.0 + 1700.0 * V_term * (0.55 + 0.45 * inj_boost) * (0.50 + 0.50 * overlap)
+
+    # thin EML penalty (engineering prior)
+    thin_eml = jnp.maximum(0.0, (_EML_FLOOR - t_eml) * _EML_FLOOR_INV)
+
+    # leakage: baseline + doping + imbalance + morphology + thin-EML term
+    leakage = (
+        0.06
+        + 0.55 * (p_d + n_d)
+        + 0.45 * (1.0 - inj_balance)
+        + 0.30 * jnp.maximum(0.0, ps_ff - 0.30)
+        + 0.55 * thin_eml
+    )
+    leakage = jnp.maximum(0.0, leakage)
+
+    # auger & droop
+    b_auger = brightness * _AUGER_NORM
+    b_norm = brightness * _BRIGHT_NORM
+    auger_rate = b_auger * b_auger * dV30
+    droop = jnp.clip(1.0 / (1.0 + b_norm * b_norm + 0.8 * auger_rate), 0.05, 1.0)
+
+    # soft penalties (constraints): each hinge is 0 when inactive
+    penalty = (
+        jnp.maximum(0.0, ps_ff - 0.45) * 6.0
+        + jnp.maximum(0.0, 12.0 - t_eml) * 0.25
+        + jnp.maximum(0.0, 0.5 - sl_gap) * 2.5
+    )
+
+    # EQE proxy (soft-saturated)
+    eqe_raw = 22.0 * inj_balance * (0.55 + 0.45 * inj_boost) * overlap * outcoupling * droop
+    eqe = 40.0 * jnp.tanh(eqe_raw * _INV_EQE_SAT)
+
+    # lifetime proxy: depends on leakage/auger/drive and thin-EML
+    lifetime = 2000.0 / (1.0 + 2.8 * leakage + 4.0 * auger_rate + 0.22 * dV30_sq + 0.9 * (p_d + n_d) + 1.2 * thin_eml)
+    lifetime = jnp.clip(lifetime, 50.0, 2000.0)
+
+    return jnp.stack(
+        [eqe, overlap, penalty, inj_balance, outcoupling, droop, brightness, leakage, auger_rate, lifetime],
+        axis=-1,
+    )
+
+
+class SurrogateSimJAX(SurrogateSim):
+    """
+    SurrogateSim whose evaluate_batch runs evaluate_jax on the default JAX device.
+
+    The (N, 13) batch is put on the device once per call and the (N, 10) result
+    copied back in one transfer; the single-design paths are SurrogateSim's.
+    Drop-in for BatchQLEDRLEnv at large N.
+    """
+
+    def evaluate_batch(self, params) -> Dict[str, np.ndarray]:
+        cols = np.stack(
+            [np.asarray(params[name], dtype=np.float32) for name in self.PARAM_NAMES], axis=-1
+        )
+        out = np.asarray(evaluate_jax(jax.device_put(cols)), dtype=np.float64)
+        return {k: out[..., j] for j, k in enumerate(_METRIC_KEYS)}
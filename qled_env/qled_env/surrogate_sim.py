@@ -1,14 +1,175 @@
 from __future__ import annotations
+from collections.abc import Mapping
+from dataclasses import dataclass
+import math
+from typing import Any, Iterator
+
 import numpy as np
+
+from ._jit import njit
 from .simulator_interface import SimulatorInterface
 
+# v3 model constants, folded once at import (numba also treats them as compile-time
+# constants). Gaussians are written as exp(-(x - c)**2 * 1/(2 sigma^2)).
+_INV_BARRIER = 1.0 / 0.06
+_EML_CENTER = 18.0
+_INV_2SIG2_EML = 1.0 / (2 * 5.0**2)
+_INV_2SIG2_MIE = 1.0 / (2 * 55.0**2)
+_INV_2SIG2_SL = 1.0 / (2 * 6.0**2)
+_INV_2SIG2_GAP = 1.0 / (2 * 0.8**2)
+_INV_FF_FULL = 1.0 / 0.30
+_INV_V_SAT = 1.0 / 1.1
+_EML_FLOOR = 15.0
+_EML_FLOOR_INV = 1.0 / _EML_FLOOR
+_AUGER_NORM = 1.0 / 1300.0
+_BRIGHT_NORM = 1.0 / 1600.0
+_INV_EQE_SAT = 1.0 / 40.0
+
 
+@njit(cache=True, inline="always")
 def _sigmoid(x: float) -> float:
-    return float(1.0 / (1.0 + np.exp(-x)))
+    return 1.0 / (1.0 + math.exp(-x))
 
 
+@njit(cache=True, inline="always")
 def _clamp(x: float, lo: float, hi: float) -> float:
-    return float(max(lo, min(hi, x)))
+    return max(lo, min(hi, x))
+
+
+@njit(cache=True, fastmath=True)
+def _evaluate_core(t_eml, phi_h, phi_e, p_d, n_d, ps_r, ps_ff, sl_t, sl_gap, qd_cov, V):
+    """
+    v3 model for one design, scalar math only (math.exp / math.tanh, no NumPy).
+
+    Returns (EQE, recomb_overlap, penalty, inj_balance, outcoupling, droop,
+    brightness, leakage, auger_rate, lifetime).
+    """
+    # injection balance proxy
+    barrier_mismatch = abs((phi_h - 5.2) - (4.1 - phi_e))
+    inj_balance = math.exp(-(barrier_mismatch ** 2) * _INV_BARRIER)
+    inj_boost = _sigmoid(8.0 * (p_d + n_d - 0.15))
+
+    # recombination overlap (narrower peak)
+    overlap = math.exp(-((t_eml - _EML_CENTER) ** 2) * _INV_2SIG2_EML)
+
+    # outcoupling proxies
+    mie_gain = 1.0 + 0.6 * math.exp(-((ps_r - 120.0) ** 2) * _INV_2SIG2_MIE)
+    cov_gain = 1.0 + 0.7 * _clamp(ps_ff * _INV_FF_FULL, 0.0, 1.0)
+    sl_gain = 1.0 + 0.4 * math.exp(-((sl_t - 15.0) ** 2) * _INV_2SIG2_SL)
+    gap_gain = 1.0 + 0.3 * math.exp(-((sl_gap - 1.2) ** 2) * _INV_2SIG2_GAP)
+    qd_gain = 0.6 + 0.4 * qd_cov
+    outcoupling = mie_gain * cov_gain * sl_gain * gap_gain * qd_gain
+
+    # V_drive terms, computed once: turn-on above 2.2 V, auger / lifetime above 3 V
+    dV22 = V - 2.2 if V > 2.2 else 0.0
+    dV30 = V - 3.0 if V > 3.0 else 0.0
+    dV30_sq = dV30 * dV30
+
+    # brightness driven by V (saturating), boosted by overlap & injection
+    V_term = -math.expm1(-dV22 * _INV_V_SAT)
+    brightness = 250.0 + 1700.0 * V_term * (0.55 + 0.45 * inj_boost) * (0.50 + 0.50 * overlap)
+
+    # thin EML penalty (engineering prior)
+    thin_eml = max(0.0, (_EML_FLOOR - t_eml) * _EML_FLOOR_INV)  # 0..1+
+
+    # leakage: baseline + doping + imbalance + morphology + thin-EML term
+    leakage = (
+        0.06
+        + 0.55 * (p_d + n_d)
+        + 0.45 * (1.0 - inj_balance)
+        + 0.30 * max(0.0, ps_ff - 0.30)
+        + 0.55 * thin_eml
+    )
+    leakage = max(0.0, leakage)
+
+    # auger & droop
+    b_auger = brightness * _AUGER_NORM
+    b_norm = brightness * _BRIGHT_NORM
+    auger_rate = b_auger * b_auger * dV30
+    droop = 1.0 / (1.0 + b_norm * b_norm + 0.8 * auger_rate)
+    droop = _clamp(droop, 0.05, 1.0)
+
+    # soft penalties (constraints): branchless, each hinge is 0 when inactive
+    penalty = (
+        max(0.0, ps_ff - 0.45) * 6.0
+        + max(0.0, 12.0 - t_eml) * 0.25
+        + max(0.0, 0.5 - sl_gap) * 2.5
+    )
+
+    # EQE proxy (soft-saturated)
+    eqe_raw = 22.0 * inj_balance * (0.55 + 0.45 * inj_boost) * overlap * outcoupling * droop
+    eqe = 40.0 * math.tanh(eqe_raw * _INV_EQE_SAT)
+
+    # lifetime proxy: depends on leakage/auger/drive and thin-EML
+    lifetime = 2000.0 / (1.0 + 2.8 * leakage + 4.0 * auger_rate + 0.22 * dV30_sq + 0.9 * (p_d + n_d) + 1.2 * thin_eml)
+    lifetime = _clamp(lifetime, 50.0, 2000.0)
+
+    return (
+        eqe, overlap, penalty, inj_balance, outcoupling,
+        droop, brightness, leakage, auger_rate, lifetime,
+    )
+
+
+_METRIC_KEYS = (
+    "EQE", "recomb_overlap", "penalty", "inj_balance", "outcoupling",
+    "droop", "brightness", "leakage", "auger_rate", "lifetime",
+)
+
+
+@dataclass(slots=True, eq=False)
+class SurrogateMetrics(Mapping):
+    """
+    SurrogateSim.evaluate_array output: the 10 model metrics plus the shaping
+    signals QLEDRLEnv.step fills in, as slots instead of a per-step dict.
+
+    Reads like the metrics dict (m["EQE"], m.get(...), == dict) and accepts
+    item assignment for the known fields, so dict-based code keeps working;
+    compute_reward reads the fields as attributes. to_info_dict() gives a plain dict.
+    """
+
+    EQE: float
+    recomb_overlap: float
+    penalty: float
+    inj_balance: float
+    outcoupling: float
+    droop: float
+    brightness: float
+    leakage: float
+    auger_rate: float
+    lifetime: float
+    # shaping signals (set by the env)
+    U_prev: float | None = None
+    delta_params_norm: float = 0.0
+    boundary_penalty: float = 0.0
+    eml_thin_penalty: float = 0.0
+    V_drive: float = 0.0
+
+    # keys are the fields only: methods / dunders must not read as metrics
+    def __getitem__(self, key: str) -> Any:
+        if key not in _METRICS_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _METRICS_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # one frame instead of Mapping.get -> __getitem__ (read per step for U_prev)
+        return getattr(self, key) if key in _METRICS_FIELDS else default
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def to_info_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+_METRICS_FIELDS = frozenset(SurrogateMetrics.__slots__)
 
 
 class SurrogateSim(SimulatorInterface):
@@ -21,87 +182,156 @@ class SurrogateSim(SimulatorInterface):
       - leakage can't be ~0 just because inj_balance ~1
     """
 
+    # positions in the ParameterSpace vector (to_real_vec order) read by evaluate_array
+    PARAM_NAMES = (
+        "t_HTL_nm", "t_EML_nm", "t_ETL_nm",
+        "phi_HTL_eV", "phi_ETL_eV",
+        "p_doping_HTL", "n_doping_ETL",
+        "ps_radius_nm", "ps_fill_frac", "sl_thickness_nm", "sl_gap_um", "qd_coverage",
+        "V_drive",
+    )
+    (
+        IDX_T_HTL, IDX_T_EML, IDX_T_ETL,
+        IDX_PHI_HTL, IDX_PHI_ETL,
+        IDX_P_DOPING, IDX_N_DOPING,
+        IDX_PS_RADIUS, IDX_PS_FILL, IDX_SL_THICKNESS, IDX_SL_GAP, IDX_QD_COVERAGE,
+        IDX_V_DRIVE,
+    ) = range(len(PARAM_NAMES))
+
+    # last `names` object seen to match PARAM_NAMES, so the check runs once per env
+    _names_ok = None
+
     def evaluate(self, params):
-        t_htl = float(params["t_HTL_nm"])
-        t_eml = float(params["t_EML_nm"])
-        t_etl = float(params["t_ETL_nm"])
+        # t_HTL_nm / t_ETL_nm are not used by the v3 model
+        values = _evaluate_core(
+            float(params["t_EML_nm"]),
+            float(params["phi_HTL_eV"]),
+            float(params["phi_ETL_eV"]),
+            float(params["p_doping_HTL"]),
+            float(params["n_doping_ETL"]),
+            float(params["ps_radius_nm"]),
+            float(params["ps_fill_frac"]),
+            float(params["sl_thickness_nm"]),
+            float(params["sl_gap_um"]),
+            float(params["qd_coverage"]),
+            float(params["V_drive"]),
+        )
+        return dict(zip(_METRIC_KEYS, values))
 
-        phi_h = float(params["phi_HTL_eV"])
-        phi_e = float(params["phi_ETL_eV"])
+    def evaluate_array(self, x_real, names=None):
+        """
+        evaluate() for a (dim,) real-parameter vector ordered as PARAM_NAMES
+        (ParameterSpace.to_real_vec output): positional reads, no dict lookups,
+        and a SurrogateMetrics instead of a fresh dict.
+        Vectors in any other order fall back to the dict path.
+        """
+        if names is not None and names is not self._names_ok:
+            if tuple(names) != self.PARAM_NAMES:
+                return super().evaluate_array(x_real, names)
+            self._names_ok = names
+        p = x_real.tolist()
+        values = _evaluate_core(
+            p[self.IDX_T_EML],
+            p[self.IDX_PHI_HTL],
+            p[self.IDX_PHI_ETL],
+            p[self.IDX_P_DOPING],
+            p[self.IDX_N_DOPING],
+            p[self.IDX_PS_RADIUS],
+            p[self.IDX_PS_FILL],
+            p[self.IDX_SL_THICKNESS],
+            p[self.IDX_SL_GAP],
+            p[self.IDX_QD_COVERAGE],
+            p[self.IDX_V_DRIVE],
+        )
+        return SurrogateMetrics(*values)
 
-        p_d = float(params["p_doping_HTL"])
-        n_d = float(params["n_doping_ETL"])
+    def evaluate_batch(self, params):
+        """
+        Vectorized evaluate: {name: (N,) array} -> {metric: (N,) float64 array}.
+        Same model as _evaluate_core, with every branch / clamp as an array op, so
+        BatchQLEDRLEnv gets all N designs from one pass instead of N dict calls.
+        (t_HTL_nm / t_ETL_nm are not used by the v3 model.)
+        """
+        t_eml = np.asarray(params["t_EML_nm"], dtype=np.float64)
 
-        ps_r = float(params["ps_radius_nm"])
-        ps_ff = float(params["ps_fill_frac"])
-        sl_t = float(params["sl_thickness_nm"])
-        sl_gap = float(params["sl_gap_um"])
-        qd_cov = float(params["qd_coverage"])
+        phi_h = np.asarray(params["phi_HTL_eV"], dtype=np.float64)
+        phi_e = np.asarray(params["phi_ETL_eV"], dtype=np.float64)
 
-        V = float(params["V_drive"])
+        p_d = np.asarray(params["p_doping_HTL"], dtype=np.float64)
+        n_d = np.asarray(params["n_doping_ETL"], dtype=np.float64)
+
+        ps_r = np.asarray(params["ps_radius_nm"], dtype=np.float64)
+        ps_ff = np.asarray(params["ps_fill_frac"], dtype=np.float64)
+        sl_t = np.asarray(params["sl_thickness_nm"], dtype=np.float64)
+        sl_gap = np.asarray(params["sl_gap_um"], dtype=np.float64)
+        qd_cov = np.asarray(params["qd_coverage"], dtype=np.float64)
+
+        V = np.asarray(params["V_drive"], dtype=np.float64)
 
         # injection balance proxy
-        barrier_mismatch = abs((phi_h - 5.2) - (4.1 - phi_e))
-        inj_balance = float(np.exp(- (barrier_mismatch ** 2) / 0.06))
-        inj_boost = _sigmoid(8.0 * (p_d + n_d - 0.15))
+        barrier_mismatch = np.abs((phi_h - 5.2) - (4.1 - phi_e))
+        inj_balance = np.exp(-(barrier_mismatch ** 2) * _INV_BARRIER)
+        inj_boost = 1.0 / (1.0 + np.exp(-8.0 * (p_d + n_d - 0.15)))
 
         # recombination overlap (narrower peak)
-        sigma = 5.0
-        overlap = float(np.exp(-((t_eml - 18.0) ** 2) / (2 * sigma**2)))
+        overlap = np.exp(-((t_eml - _EML_CENTER) ** 2) * _INV_2SIG2_EML)
 
         # outcoupling proxies
-        mie_gain = 1.0 + 0.6 * np.exp(-((ps_r - 120.0) ** 2) / (2 * 55.0**2))
-        cov_gain = 1.0 + 0.7 * np.clip(ps_ff / 0.30, 0.0, 1.0)
-        sl_gain = 1.0 + 0.4 * np.exp(-((sl_t - 15.0) ** 2) / (2 * 6.0**2))
-        gap_gain = 1.0 + 0.3 * np.exp(-((sl_gap - 1.2) ** 2) / (2 * 0.8**2))
+        mie_gain = 1.0 + 0.6 * np.exp(-((ps_r - 120.0) ** 2) * _INV_2SIG2_MIE)
+        cov_gain = 1.0 + 0.7 * np.clip(ps_ff * _INV_FF_FULL, 0.0, 1.0)
+        sl_gain = 1.0 + 0.4 * np.exp(-((sl_t - 15.0) ** 2) * _INV_2SIG2_SL)
+        gap_gain = 1.0 + 0.3 * np.exp(-((sl_gap - 1.2) ** 2) * _INV_2SIG2_GAP)
         qd_gain = 0.6 + 0.4 * qd_cov
-        outcoupling = float(mie_gain * cov_gain * sl_gain * gap_gain * qd_gain)
+        outcoupling = mie_gain * cov_gain * sl_gain * gap_gain * qd_gain
+
+        # V_drive terms, computed once: turn-on above 2.2 V, auger / lifetime above 3 V
+        dV22 = np.maximum(0.0, V - 2.2)
+        dV30 = np.maximum(0.0, V - 3.0)
+        dV30_sq = dV30 * dV30
 
         # brightness driven by V (saturating), boosted by overlap & injection
-        drive = max(0.0, V - 2.2)
-        V_term = 1.0 - np.exp(-drive / 1.1)
-        brightness = float(250.0 + 1700.0 * V_term * (0.55 + 0.45 * inj_boost) * (0.50 + 0.50 * overlap))
+        V_term = -np.expm1(-dV22 * _INV_V_SAT)
+        brightness = 250.0 + 1700.0 * V_term * (0.55 + 0.45 * inj_boost) * (0.50 + 0.50 * overlap)
 
         # thin EML penalty (engineering prior)
-        eml_floor = 15.0
-        thin_eml = max(0.0, (eml_floor - t_eml) / eml_floor)  # 0..1+
+        thin_eml = np.maximum(0.0, (_EML_FLOOR - t_eml) * _EML_FLOOR_INV)  # 0..1+
 
         # leakage: baseline + doping + imbalance + morphology + thin-EML term
         leakage = (
             0.06
             + 0.55 * (p_d + n_d)
             + 0.45 * (1.0 - inj_balance)
-            + 0.30 * max(0.0, ps_ff - 0.30)
+            + 0.30 * np.maximum(0.0, ps_ff - 0.30)
             + 0.55 * thin_eml
         )
-        leakage = float(max(0.0, leakage))
+        leakage = np.maximum(0.0, leakage)
 
         # auger & droop
-        auger_rate = float((brightness / 1300.0) ** 2 * max(0.0, V - 3.0))
-        droop = float(1.0 / (1.0 + (brightness / 1600.0) ** 2 + 0.8 * auger_rate))
-        droop = _clamp(droop, 0.05, 1.0)
-
-        # soft penalties (constraints)
-        penalty = 0.0
-        if ps_ff > 0.45:
-            penalty += (ps_ff - 0.45) * 6.0
-        if t_eml < 12.0:
-            penalty += (12.0 - t_eml) * 0.25
-        if sl_gap < 0.5:
-            penalty += (0.5 - sl_gap) * 2.5
+        b_auger = brightness * _AUGER_NORM
+        b_norm = brightness * _BRIGHT_NORM
+        auger_rate = b_auger * b_auger * dV30
+        droop = 1.0 / (1.0 + b_norm * b_norm + 0.8 * auger_rate)
+        droop = np.clip(droop, 0.05, 1.0)
+
+        # soft penalties (constraints): each hinge is 0 when inactive
+        penalty = (
+            np.maximum(0.0, ps_ff - 0.45) * 6.0
+            + np.maximum(0.0, 12.0 - t_eml) * 0.25
+            + np.maximum(0.0, 0.5 - sl_gap) * 2.5
+        )
 
         # EQE proxy (soft-saturated)
         eqe_raw = 22.0 * inj_balance * (0.55 + 0.45 * inj_boost) * overlap * outcoupling * droop
-        eqe = float(40.0 * np.tanh(eqe_raw / 40.0))
+        eqe = 40.0 * np.tanh(eqe_raw * _INV_EQE_SAT)
 
         # lifetime proxy: depends on leakage/auger/drive and thin-EML
-        lifetime = 2000.0 / (1.0 + 2.8 * leakage + 4.0 * auger_rate + 0.22 * (max(0.0, V - 3.0) ** 2) + 0.9 * (p_d + n_d) + 1.2 * thin_eml)
-        lifetime = float(_clamp(lifetime, 50.0, 2000.0))
+        lifetime = 2000.0 / (1.0 + 2.8 * leakage + 4.0 * auger_rate + 0.22 * dV30_sq + 0.9 * (p_d + n_d) + 1.2 * thin_eml)
+        lifetime = np.clip(lifetime, 50.0, 2000.0)
 
         return {
             "EQE": eqe,
             "recomb_overlap": overlap,
-            "penalty": float(penalty),
+            "penalty": penalty,
             "inj_balance": inj_balance,
             "outcoupling": outcoupling,
             "droop": droop,
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict
+
+import numpy as np
+import gymnasium as gym
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+from .parameter_space import ParameterSpace
+from .reward_function import RewardBatch, compute_reward_batch
+from .rl_env import QLEDRLEnv
+from .simulator_interface import SimulatorInterface
+
+
+class BatchQLEDRLEnv(gym.vector.VectorEnv):
+    """
+    N copies of QLEDRLEnv stepped together with array ops.
+
+    Same dynamics, shaping signals and reward as QLEDRLEnv.step, but every quantity
+    is an (N, ...) array: the design points live in one contiguous (N, dim) float32
+    buffer, the simulator is called once per step through evaluate_batch, and the
+    reward goes through compute_reward_batch.
+
+    Only the envs whose episode ended are re-initialized (indexed reset); the other
+    rows keep their state. With autoreset_mode=NEXT_STEP (default) that happens on
+    the step after they end. With SAME_STEP it happens within the ending step: the
+    returned obs rows are the fresh episodes and infos["final_obs"] holds the
+    terminal observations, valid where infos["_final_obs"] is True.
+
+    infos carries the batched "params" / "metrics" columns ({key: (N,) array}) and
+    the (N, M) "violation" matrix, ordered as param_space.constraint_names.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        simulator: SimulatorInterface,
+        param_space: ParameterSpace,
+        num_envs: int,
+        max_steps: int = 30,
+        action_scale: float = 0.05,
+        include_metrics_in_obs: bool = False,
+        seed: int | None = None,
+        autoreset_mode: AutoresetMode = AutoresetMode.NEXT_STEP,
+    ):
+        super().__init__()
+        autoreset_mode = AutoresetMode(autoreset_mode)
+        if autoreset_mode not in (AutoresetMode.NEXT_STEP, AutoresetMode.SAME_STEP):
+            raise ValueError(f"unsupported autoreset_mode: {autoreset_mode}")
+        self.metadata = {**self.metadata, "autoreset_mode": autoreset_mode}
+        self._same_step = autoreset_mode == AutoresetMode.SAME_STEP
+        self.simulator = simulator
+        self.ps = param_space
+        self.num_envs = int(num_envs)
+        self.max_steps = int(max_steps)
+        self.action_scale = float(action_scale)
+        self.include_metrics_in_obs = bool(include_metrics_in_obs)
+
+        self.rng = np.random.default_rng(seed)
+
+        obs_dim = self.ps.dim
+        if self.include_metrics_in_obs:
+            obs_dim += self.ps.metrics_dim
+
+        self.single_observation_space = spaces.Box(
+            low=-1.0, high=1.0, shape=(obs_dim,), dtype=np.float32
+        )
+        self.single_action_space = spaces.Box(
+            low=-1.0, high=1.0, shape=(self.ps.dim,), dtype=np.float32
+        )
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+        n, d = self.num_envs, self.ps.dim
+        self.X = np.zeros((n, d), dtype=np.float32)
+        self._prev_X = np.zeros((n, d), dtype=np.float32)
+        self.step_count = np.zeros(n, dtype=np.int64)
+        # shaping memory: NaN marks "no previous U" (first step of an episode)
+        self._U_prev = np.full(n, np.nan)
+        self._autoreset = np.zeros(n, dtype=bool)
+
+        self._eml_col = self.ps.idx.get("t_EML_nm")
+        self._v_col = self.ps.idx.get("V_drive")
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        if seed is not None:
+            # same rule as QLEDRLEnv.reset: gymnasium just seeded np_random with the
+            # stream default_rng(seed) gives, so use it rather than a second generator
+            self.rng = self.np_random
+
+        if options and "init_params" in options:
+            self.X[:] = self.ps.to_normalized(options["init_params"])
+        else:
+            self.X[:] = self.rng.uniform(-1.0, 1.0, size=self.X.shape)
+
+        self.step_count[:] = 0
+        self._U_prev[:] = np.nan
+        self._prev_X[:] = self.X
+        self._autoreset[:] = False
+
+        x_real = self.ps.to_real_vec(self.X)
+        params_real = self._param_columns(x_real)
+        metrics = self.simulator.evaluate_batch(params_real)
+
+        infos = {"params": params_real, "metrics": metrics}
+        return self._build_obs(), infos
+
+    def step(self, actions):
+        actions = np.clip(np.asarray(actions, dtype=np.float32), -1.0, 1.0)
+
+        # NEXT_STEP: envs that ended last step start a new episode now (actions ignored)
+        done = self._autoreset
+        if done.any():
+            self._reset_indices(np.flatnonzero(done))
+        live = ~done
+
+        self.step_count[live] += 1
+        # delta_params_norm is measured from the pre-step point
+        np.copyto(self._prev_X, self.X, where=live[:, None])
+        X_new = np.clip(self.X + self.action_scale * actions, -1.0, 1.0)
+        np.copyto(self.X, X_new, where=live[:, None])
+
+        x_real = self.ps.to_real_vec(self.X)
+        params_real = self._param_columns(x_real)
+
+        violation = self.ps.constraint_violation_vec(x_real)
+        metrics = self.simulator.evaluate_batch(params_real)
+
+        # delta_params_norm in normalized space
+        d = self.X - self._prev_X
+        delta_params_norm = np.sqrt(np.einsum("ij,ij->i", d, d))
+
+        # stronger boundary penalty (4th power makes edges expensive)
+        margin = 0.88
+        excess = np.maximum(0.0, np.abs(self.X) - margin) / (1.0 - margin)
+        excess *= excess  # excess**4 as two squarings, not the generic pow path
+        excess *= excess
+        boundary_penalty = np.mean(excess, axis=1)
+
+        # EML thin penalty (engineering prior): thin EML often increases leakage/quenching
+        n = self.num_envs
+        t_eml = x_real[:, self._eml_col] if self._eml_col is not None else np.zeros(n)
+        eml_floor = 15.0
+        eml_thin_penalty = np.maximum(0.0, (eml_floor - t_eml) / eml_floor) ** 2
+
+        # inject shaping signals for reward
+        metrics["delta_params_norm"] = delta_params_norm
+        metrics["boundary_penalty"] = boundary_penalty
+        metrics["eml_thin_penalty"] = eml_thin_penalty
+        metrics["V_drive"] = x_real[:, self._v_col] if self._v_col is not None else np.zeros(n)
+
+        batch = RewardBatch.from_columns(metrics, n, violation, self._U_prev)
+        U = np.empty(n, dtype=np.float64)
+        rewards = compute_reward_batch(batch, U_out=U)
+
+        terminations = np.any(violation > 20.0, axis=1)
+        truncations = self.step_count >= self.max_steps
+
+        # rows that were reset this step report a fresh start, not a transition
+        rewards[done] = 0.0
+        terminations[done] = False
+        truncations[done] = False
+
+        # update shaping memory
+        np.copyto(self._U_prev, U, where=live)
+
+        infos = {"params": params_real, "metrics": metrics, "violation": violation}
+        obs = self._build_obs()
+        ended = terminations | truncations
+        if not self._same_step:
+            self._autoreset = ended
+        elif ended.any():
+            # SAME_STEP: keep the terminal rows, then restart only those envs
+            infos["final_obs"] = obs.copy()
+            infos["_final_obs"] = ended
+            idx = np.flatnonzero(ended)
+            self._reset_indices(idx)
+            obs[idx, : self.ps.dim] = self.X[idx]
+        return obs, rewards, terminations, truncations, infos
+
+    def _reset_indices(self, idx: np.ndarray) -> None:
+        """Start fresh episodes in rows `idx` only; every other env keeps its state."""
+        self.X[idx] = self.rng.uniform(-1.0, 1.0, size=(idx.size, self.ps.dim))
+        self._prev_X[idx] = self.X[idx]
+        self.step_count[idx] = 0
+        self._U_prev[idx] = np.nan
+
+    def _param_columns(self, x_real: np.ndarray) -> Dict[str, Any]:
+        # column views, no per-env dicts
+        return {name: x_real[:, j] for j, name in enumerate(self.ps.names)}
+
+    def _build_obs(self):
+        if not self.include_metrics_in_obs:
+            return self.X.copy()
+        # one allocation, filled by slices (no concatenate); metrics part is zeros for now
+        d = self.ps.dim
+        obs = np.empty((self.num_envs, d + self.ps.metrics_dim), dtype=np.float32)
+        obs[:, :d] = self.X
+        obs[:, d:] = 0.0
+        return obs
+
+
+class _QLEDEnvFactory:
+    """Picklable env_fn for AsyncVectorEnv: builds the simulator inside the worker."""
+
+    def __init__(self, simulator_fn, param_space, seed, env_kwargs):
+        self.simulator_fn = simulator_fn
+        self.param_space = param_space
+        self.seed = seed
+        self.env_kwargs = env_kwargs
+
+    def __call__(self) -> QLEDRLEnv:
+        return QLEDRLEnv(self.simulator_fn(), self.param_space, seed=self.seed, **self.env_kwargs)
+
+
+def make_async_vector_env(
+    simulator_fn: Callable[[], SimulatorInterface],
+    param_space: ParameterSpace,
+    num_envs: int,
+    seed: int | None = None,
+    context: str | None = "spawn",
+    **env_kwargs,
+) -> gym.vector.AsyncVectorEnv:
+    """
+    N QLEDRLEnv instances, one per worker subprocess, stepped in parallel.
+
+    For simulators that are expensive per call and cannot be batched (e.g. a COMSOL
+    runner), where BatchQLEDRLEnv brings nothing and a single env leaves the other
+    cores idle. `simulator_fn` is called once in each worker, so live handles
+    (solver sessions, open files) never have to be pickled; a class such as
+    SurrogateSim works as-is. Worker i is seeded with seed + i.
+
+    Workers are started with "spawn" by default: forking a process whose numba
+    thread pool is already running (e.g. after a BatchQLEDRLEnv step) can deadlock
+    the child. Pass context="fork" for faster startup when that cannot happen.
+
+    Observations come back through shared memory rather than pickled per step.
+    Episodes auto-reset within the same step: the returned obs is the reset obs and
+    the terminal one is in infos["final_obs"] (infos["final_info"] for its info).
+    Extra keyword arguments go to QLEDRLEnv (max_steps, action_scale, ...).
+    """
+    env_fns = [
+        _QLEDEnvFactory(simulator_fn, param_space, None if seed is None else seed + i, env_kwargs)
+        for i in range(int(num_envs))
+    ]
+    return gym.vector.AsyncVectorEnv(
+        env_fns,
+        shared_memory=True,
+        context=context,
+        autoreset_mode=AutoresetMode.SAME_STEP,
+    )
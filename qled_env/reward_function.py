@@ -0,0 +1,24 @@
+# Single source of truth is qled_env/qled_env/reward_function.py (reward v10).
+from .qled_env.reward_function import (
+    RewardBatch,
+    RewardConfig,
+    RewardInfo,
+    V10_CFG,
+    compute_reward,
+    compute_reward_batch,
+    compute_reward_info,
+    compute_reward_scalar,
+    stack_metrics,
+)
+
+__all__ = [
+    "RewardBatch",
+    "RewardConfig",
+    "RewardInfo",
+    "V10_CFG",
+    "compute_reward",
+    "compute_reward_batch",
+    "compute_reward_info",
+    "compute_reward_scalar",
+    "stack_metrics",
+]
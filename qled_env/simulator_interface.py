@@ -1,6 +1,9 @@
 import numpy as np
 from .comsol_parser import parse_comsol_csv
 
+# scalar metrics returned by every route (and by evaluate_batch)
+_BATCH_KEYS = ("EQE", "recomb_overlap", "penalty")
+
 class QLEDSimulator:
     """
     Unifies three modes:
@@ -29,6 +32,22 @@ class QLEDSimulator:
         # Default: mock physics proxy
         return self._mock_physics(design)
 
+    def evaluate_batch(self, designs: dict) -> dict:
+        """
+        evaluate() for many designs given as columns ({name: (N,) array}, e.g.
+        sample_design(n=N)); returns {"EQE", "recomb_overlap", "penalty"} as (N,) arrays.
+
+        The analytic routes run as array ops over the whole batch. COMSOL results
+        come one file per design, so that route still goes design by design.
+        """
+        if self.use_comsol and "comsol_csv" in designs:
+            n = len(designs["comsol_csv"])
+            rows = [self.evaluate({k: v[i] for k, v in designs.items()}) for i in range(n)]
+            return {k: np.array([r[k] for r in rows], dtype=np.float64) for k in _BATCH_KEYS}
+
+        # surrogate route is still an alias of mock physics (see _mock_surrogate)
+        return self._mock_physics_batch(designs)
+
     def _mock_physics(self, design: dict) -> dict:
         ZnO_ratio = design["ZnO_ratio"]
         QD_layers = design["QD_layers"]
@@ -49,6 +68,25 @@ class QLEDSimulator:
             "penalty": float(thickness_penalty),
         }
 
+    def _mock_physics_batch(self, designs: dict) -> dict:
+        # same formulas as _mock_physics, elementwise over the columns
+        ZnO_ratio = np.asarray(designs["ZnO_ratio"], dtype=np.float64)
+        QD_layers = np.asarray(designs["QD_layers"])
+        bias = np.asarray(designs["bias_V"], dtype=np.float64)
+
+        balance_factor = np.exp(-np.abs(ZnO_ratio - 0.5) * 4.0)
+        layer_factor = np.where(QD_layers == 2, 0.9, 0.8)
+        thickness_penalty = np.maximum(0.0, bias - 3.5) * 0.02
+
+        eqe = 0.12 + 0.08 * balance_factor * layer_factor - thickness_penalty
+        overlap = 0.6 + 0.3 * balance_factor
+
+        return {
+            "EQE": np.maximum(eqe, 0.0),
+            "recomb_overlap": np.minimum(overlap, 1.0),
+            "penalty": thickness_penalty,
+        }
+
     def _mock_surrogate(self, design: dict) -> dict:
         # For now, just alias mock physics. Replace with real model prediction.
         return self._mock_physics(design)
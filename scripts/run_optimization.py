@@ -1,8 +1,13 @@
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
 from agent.dqn_agent import DQNAgent
 from qled_env.simulator_interface import QLEDSimulator
 from qled_env.parameter_space import sample_design
-from qled_env.reward_function import compute_reward
+from qled_env.reward_function import RewardBatch, compute_reward_batch
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Run RL-based QLED architecture optimization.")
@@ -12,6 +17,12 @@ def parse_args():
                         help="Use surrogate model instead of mock physics.")
     parser.add_argument("--use_comsol", action="store_true",
                         help="Use COMSOL CSV results (developer mode).")
+    parser.add_argument("--batch_size", type=int, default=64,
+                        help="Designs sampled and evaluated together per chunk.")
+    parser.add_argument("--log_every", type=int, default=100,
+                        help="Print a progress summary every N episodes.")
+    parser.add_argument("--out_csv", type=str, default=None,
+                        help="Optional CSV path for the per-episode records.")
     return parser.parse_args()
 
 def main():
@@ -27,28 +38,74 @@ def main():
         action_dim=sim.action_dim,
     )
 
-    for ep in range(args.episodes):
-        # Stateless design proposal for now (contextual bandit style).
-        design = sample_design()
-        metrics = sim.evaluate(design)
-        reward = compute_reward(metrics)
-
-        agent.learn(
-            state=design,
-            action=None,
-            reward=reward,
-            next_state=None,
-            done=True,
-        )
-
-        print(
-            f"[Episode {ep+1:03d}] "
-            f"EQE={metrics.get('EQE', 0):.3f}  "
-            f"overlap={metrics.get('recomb_overlap', 0):.3f}  "
-            f"reward={reward:.3f}"
-        )
+    # per-episode records are kept as plain tuples; no formatting / I/O in the loop
+    records = []
+    log_every = max(1, args.log_every)
+
+    batch_size = max(1, args.batch_size)
+
+    # Stateless design proposals (contextual bandit style), so a whole chunk of
+    # episodes is sampled, simulated and scored at once as columns.
+    sizes = [min(batch_size, args.episodes - start) for start in range(0, args.episodes, batch_size)]
+
+    ep = 0
+    # One simulator thread runs a chunk ahead: while chunk k is scored and fed to
+    # the agent here, chunk k+1 is sampled and simulated (at most two in flight).
+    # Chunks are submitted in order, so the design sequence is the same as unthreaded.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(_simulate_chunk, sim, sizes[0]) if sizes else None
+        for k, n in enumerate(sizes):
+            designs, metrics = pending.result()
+            if k + 1 < len(sizes):
+                pending = pool.submit(_simulate_chunk, sim, sizes[k + 1])
+
+            rewards = compute_reward_batch(RewardBatch.from_columns(metrics, n))
+
+            eqe = metrics["EQE"].tolist()
+            overlap = metrics["recomb_overlap"].tolist()
+            for i, (design, reward) in enumerate(zip(_design_rows(designs), rewards.tolist())):
+                agent.learn(
+                    state=design,
+                    action=None,
+                    reward=reward,
+                    next_state=None,
+                    done=True,
+                )
+
+                ep += 1
+                records.append((ep, eqe[i], overlap[i], reward))
+                if ep % log_every == 0:
+                    _print_summary(records[-log_every:])
+
+    if records and len(records) % log_every:
+        _print_summary(records[-(len(records) % log_every):])
+
+    if args.out_csv:
+        out = Path(args.out_csv)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(records, columns=["episode", "EQE", "recomb_overlap", "reward"]).to_csv(out, index=False)
+        print(f"Saved {len(records)} episode records to {out}")
 
     print("Optimization run completed.")
 
+def _simulate_chunk(sim, n):
+    designs = sample_design(n=n)
+    return designs, sim.evaluate_batch(designs)
+
+def _design_rows(designs):
+    # per-episode design dicts for the agent, built from the columns in one pass
+    names = list(designs)
+    return [dict(zip(names, row)) for row in zip(*(col.tolist() for col in designs.values()))]
+
+def _print_summary(window):
+    first, last = window[0][0], window[-1][0]
+    best = max(window, key=lambda r: r[3])
+    mean_reward = sum(r[3] for r in window) / len(window)
+    print(
+        f"[Episodes {first:03d}-{last:03d}] "
+        f"mean reward={mean_reward:.3f}  "
+        f"best: ep {best[0]:03d} EQE={best[1]:.3f} overlap={best[2]:.3f} reward={best[3]:.3f}"
+    )
+
 if __name__ == "__main__":
     main()
@@ -1,19 +1,60 @@
+import math
+
 import numpy as np
 
+from qled_env.qled_env._jit import njit
 from qled_env.qled_env.parameter_space import ParameterSpace
 from qled_env.qled_env.rl_env import QLEDRLEnv
 from qled_env.qled_env.simulator_interface import SimulatorInterface
+from qled_env.qled_env.vector_env import BatchQLEDRLEnv
+
+
+@njit(cache=True, fastmath=True)
+def _dummy_eval(x, ps_fill):
+    # simple smooth "hill" for EQE, peak near mid-range; one pass for the mean, one for the spread
+    n = x.shape[0]
+    mean = 0.0
+    for i in range(n):
+        mean += x[i]
+    mean /= n
+    ss = 0.0
+    for i in range(n):
+        d = x[i] - mean
+        ss += d * d
+    eqe = math.exp(-ss / (ss / n + 1e-6))
+    overlap = min(max(1.0 - abs(ps_fill - 0.25), 0.0), 1.0)
+    return eqe, overlap
 
 
 class DummySim(SimulatorInterface):
+    def __init__(self):
+        # names sequence seen by evaluate_array and its ps_fill_frac column, resolved once
+        self._names = None
+        self._fill_col = 0
+
     def evaluate(self, params):
-        # simple smooth "hill" for EQE, peak near mid-range
-        x = np.array(list(params.values()), dtype=float)
-        eqe = float(np.exp(-np.sum((x - np.mean(x)) ** 2) / (np.var(x) + 1e-6)))
-        overlap = float(np.clip(1.0 - abs(params["ps_fill_frac"] - 0.25), 0.0, 1.0))
+        x = np.fromiter(params.values(), dtype=np.float64, count=len(params))
+        eqe, overlap = _dummy_eval(x, float(params["ps_fill_frac"]))
         penalty = 0.0
         return {"EQE": eqe, "recomb_overlap": overlap, "penalty": penalty}
 
+    def evaluate_array(self, x_real, names):
+        # env hot path: read the vector positionally, no params dict
+        if names is not self._names:
+            self._names = names
+            self._fill_col = list(names).index("ps_fill_frac")
+        x = np.asarray(x_real, dtype=np.float64)
+        eqe, overlap = _dummy_eval(x, float(x[self._fill_col]))
+        return {"EQE": eqe, "recomb_overlap": overlap, "penalty": 0.0}
+
+    def evaluate_batch(self, params):
+        # same hill on the (N, D) design matrix, one row per env
+        X = np.stack([np.asarray(v, dtype=float) for v in params.values()], axis=1)
+        d = X - X.mean(axis=1, keepdims=True)
+        eqe = np.exp(-np.sum(d * d, axis=1) / (X.var(axis=1) + 1e-6))
+        overlap = np.clip(1.0 - np.abs(np.asarray(params["ps_fill_frac"]) - 0.25), 0.0, 1.0)
+        return {"EQE": eqe, "recomb_overlap": overlap, "penalty": np.zeros_like(eqe)}
+
 
 if __name__ == "__main__":
     ps = ParameterSpace()
@@ -29,4 +70,12 @@ if __name__ == "__main__":
         a = env.action_space.sample()
         obs, r, terminated, truncated, info = env.step(a)
         print(f"STEP {i}: r={r:.4f}, term={terminated}, trunc={truncated}, EQE={info['metrics'].get('EQE')}")
+
+    venv = BatchQLEDRLEnv(simulator=DummySim(), param_space=ps, num_envs=8, max_steps=5)
+    obs, infos = venv.reset(seed=0)
+    print("BATCH RESET OK")
+    print("  obs shape:", obs.shape)
+    for i in range(5):
+        obs, r, terminated, truncated, infos = venv.step(venv.action_space.sample())
+        print(f"BATCH STEP {i}: mean r={r.mean():.4f}, mean EQE={infos['metrics']['EQE'].mean():.4f}")
     print("SMOKE TEST PASSED ✅")
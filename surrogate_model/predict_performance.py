@@ -1,10 +1,17 @@
 import json
+import operator
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Sequence
 
 import numpy as np
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
+
+try:
+    import onnxruntime as ort
+except ImportError:  # optional: without it, inference runs in PyTorch
+    ort = None
 
 
 class SurrogateMLP(nn.Module):
@@ -19,36 +26,131 @@ class SurrogateMLP(nn.Module):
         )
 
     def forward(self, x):
-        return self.net(x)
+        # Linear + in-place ReLU per hidden layer, called functionally: no separate
+        # ReLU output buffer and no nn.Sequential / per-layer module dispatch.
+        # Parameters stay in self.net, so state_dict keys are unchanged.
+        fc0, fc1, head = self.net[0], self.net[2], self.net[4]
+        h = F.linear(x, fc0.weight, fc0.bias).relu_()
+        h = F.linear(h, fc1.weight, fc1.bias).relu_()
+        return F.linear(h, head.weight, head.bias)
+
+
+# returned metric name -> model output column it is read from
+_METRIC_SOURCES = (
+    ("EQE", "EQE_sim"),
+    ("recomb_overlap", "recomb_overlap"),
+    ("penalty", "penalty"),
+)
 
 
 class SurrogatePredictor:
-    def __init__(self, artifacts_dir: str = "surrogate_model/artifacts"):
+    """
+    Loads the trained SurrogateMLP artifacts and maps design dicts to metrics.
+
+    compile_model=True wraps the MLP in torch.compile(mode="reduce-overhead") and
+    warms it up once. That targets GPU launch overhead (CUDA graphs); on CPU the
+    guard checks cost more than this small net saves, so it is off by default.
+
+    If the artifacts include surrogate.onnx (train_surrogate.py --onnx) and
+    onnxruntime is installed, predictions run through an ONNX Runtime session
+    instead, which has much less per-call overhead than eager PyTorch for a net
+    this small. use_onnx=False forces the PyTorch path.
+
+    num_threads pins the intra-op thread count of torch (and of the ONNX Runtime
+    session). Inference-only processes should pass 1: a (1, 5) -> 64 -> 64 -> 3
+    forward is far too small to split across threads, and waking a pool per call
+    costs more than it saves and adds latency spikes. torch's setting is
+    process-wide (it would also throttle e.g. PPO updates in the same process),
+    so the default None leaves it untouched.
+    """
+
+    def __init__(
+        self,
+        artifacts_dir: str = "surrogate_model/artifacts",
+        compile_model: bool = False,
+        use_onnx: bool = True,
+        num_threads: int | None = None,
+    ):
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+            try:
+                torch.set_num_interop_threads(num_threads)
+            except RuntimeError:
+                # only settable once, before any inter-op parallel work has started
+                pass
+
         artifacts = Path(artifacts_dir)
         with open(artifacts / "meta.json", "r", encoding="utf-8") as f:
             meta = json.load(f)
 
         self.feature_cols = meta["feature_cols"]
         self.target_cols = meta["target_cols"]
+        # output position of each metric, resolved once (None: not predicted -> 0.0)
+        self._metric_idx = tuple(
+            (name, self.target_cols.index(src) if src in self.target_cols else None)
+            for name, src in _METRIC_SOURCES
+        )
 
         self.model = SurrogateMLP(
             in_dim=len(self.feature_cols),
             out_dim=len(self.target_cols),
         )
-        state_dict = torch.load(artifacts / "surrogate_mlp.pt", map_location="cpu")
+        state_dict = torch.load(artifacts / "surrogate_mlp.pt", map_location="cpu", weights_only=True)
         self.model.load_state_dict(state_dict)
         self.model.eval()
 
+        # predict() path: one bound getter and a reused (1, D) input, no per-call lists/tensors
+        self._getter = operator.itemgetter(*self.feature_cols)
+        self._buf = np.empty((1, len(self.feature_cols)), dtype=np.float32)
+        self._t = torch.from_numpy(self._buf)  # shares memory with _buf
+
+        self._session = None
+        onnx_path = artifacts / "surrogate.onnx"
+        if use_onnx and ort is not None and onnx_path.exists():
+            opts = ort.SessionOptions()
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if num_threads is not None:
+                opts.intra_op_num_threads = num_threads
+                opts.inter_op_num_threads = num_threads
+            self._session = ort.InferenceSession(
+                str(onnx_path), sess_options=opts, providers=["CPUExecutionProvider"]
+            )
+
+        if self._session is None and compile_model and hasattr(torch, "compile"):
+            self.model = torch.compile(self.model, mode="reduce-overhead", dynamic=False)
+            # warm-up: the first call pays the compile, not the first real prediction
+            with torch.inference_mode():
+                self.model(torch.zeros(1, len(self.feature_cols)))
+
     def predict(self, design: Dict) -> Dict:
-        x = np.array([design[col] for col in self.feature_cols], dtype=float)
-        x_t = torch.tensor(x, dtype=torch.float32).unsqueeze(0)
-        with torch.no_grad():
-            y_pred = self.model(x_t).numpy().squeeze(0)
-
-        out = dict(zip(self.target_cols, y_pred.tolist()))
-        # Map back to metrics naming used elsewhere
-        return {
-            "EQE": float(out.get("EQE_sim", 0.0)),
-            "recomb_overlap": float(out.get("recomb_overlap", 0.0)),
-            "penalty": float(out.get("penalty", 0.0)),
-        }
+        # writes into the shared input buffer: not safe to call concurrently on one predictor
+        self._buf[0, :] = self._getter(design)
+        if self._session is not None:
+            row = self._session.run(None, {"x": self._buf})[0][0].tolist()
+        else:
+            with torch.inference_mode():
+                row = self.model(self._t)[0].tolist()
+
+        return self._to_metrics(row)
+
+    def predict_batch(self, designs: Sequence[Dict]) -> List[Dict]:
+        """
+        predict() for many designs with a single forward pass.
+
+        Features are gathered column by column into one (N, D) float32 array, which
+        torch.from_numpy wraps without a copy.
+        """
+        x = np.empty((len(designs), len(self.feature_cols)), dtype=np.float32)
+        for j, col in enumerate(self.feature_cols):
+            x[:, j] = [design[col] for design in designs]
+        if self._session is not None:
+            y_pred = self._session.run(None, {"x": x})[0]
+        else:
+            with torch.inference_mode():
+                y_pred = self.model(torch.from_numpy(x)).numpy()
+
+        return [self._to_metrics(row) for row in y_pred.tolist()]
+
+    def _to_metrics(self, row: List[float]) -> Dict:
+        # Map back to metrics naming used elsewhere, by precomputed output position
+        return {name: 0.0 if j is None else row[j] for name, j in self._metric_idx}
@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
 
 
@@ -36,13 +37,26 @@ class SurrogateMLP(nn.Module):
         )
 
     def forward(self, x):
-        return self.net(x)
+        # Linear + in-place ReLU per hidden layer, called functionally: no separate
+        # ReLU output buffer and no nn.Sequential / per-layer module dispatch.
+        # Parameters stay in self.net, so state_dict keys are unchanged.
+        fc0, fc1, head = self.net[0], self.net[2], self.net[4]
+        h = F.linear(x, fc0.weight, fc0.bias).relu_()
+        h = F.linear(h, fc1.weight, fc1.bias).relu_()
+        return F.linear(h, head.weight, head.bias)
 
 
 def load_data(csv_path: Path):
-    df = pd.read_csv(csv_path)
-    X = df[FEATURE_COLS].to_numpy(dtype=float)
-    y = df[["EQE_sim", "recomb_overlap", "penalty"]].to_numpy(dtype=float)
+    # parse only the columns we train on, straight to float32 (the dtype the model uses)
+    cols = FEATURE_COLS + TARGET_COLS
+    df = pd.read_csv(
+        csv_path,
+        usecols=cols,
+        dtype={c: np.float32 for c in cols},
+        engine="c",
+    )
+    X = df[FEATURE_COLS].to_numpy(dtype=np.float32)
+    y = df[TARGET_COLS].to_numpy(dtype=np.float32)
     return X, y
 
 
@@ -55,14 +69,20 @@ def train_model(X, y, epochs: int = 500, lr: float = 1e-3):
     model = SurrogateMLP(in_dim=X.shape[1], out_dim=y.shape[1])
     model.to(device)
 
-    optimizer = optim.Adam(model.parameters(), lr=lr)
-    criterion = nn.MSELoss()
-
+    # fused: the whole parameter update is one kernel per step instead of a
+    # per-tensor loop of small ops (older torch builds only have it on CUDA)
+    try:
+        optimizer = optim.Adam(model.parameters(), lr=lr, fused=True)
+    except (RuntimeError, TypeError):
+        optimizer = optim.Adam(model.parameters(), lr=lr, foreach=True)
+
+    # full-batch GD on a small net is dispatch-bound: keep the loop body to the
+    # bare forward / backward / step (functional loss, train() set once, and
+    # loss.item() - a host sync - only when logging)
+    model.train()
     for epoch in range(epochs):
-        model.train()
-        optimizer.zero_grad()
-        preds = model(X_t)
-        loss = criterion(preds, y_t)
+        optimizer.zero_grad(set_to_none=True)
+        loss = F.mse_loss(model(X_t), y_t)
         loss.backward()
         optimizer.step()
 
@@ -77,6 +97,24 @@ def save_model(model: nn.Module, out_path: Path):
     torch.save(model.state_dict(), out_path)
 
 
+def save_onnx(model: nn.Module, out_path: Path, in_dim: int):
+    """Export the MLP for SurrogatePredictor's ONNX Runtime path (needs the onnx package)."""
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    model.eval()
+    torch.onnx.export(
+        model,
+        (torch.zeros(1, in_dim),),
+        str(out_path),
+        opset_version=17,
+        input_names=["x"],
+        output_names=["y"],
+        dynamic_axes={"x": {0: "batch"}, "y": {0: "batch"}},
+        # TorchScript-based exporter: the dynamo one (default on recent torch) also
+        # needs onnxscript, and takes dynamic_shapes rather than dynamic_axes
+        dynamo=False,
+    )
+
+
 def save_meta(out_path: Path):
     meta = {
         "feature_cols": FEATURE_COLS,
@@ -102,6 +140,11 @@ def main():
     )
     parser.add_argument("--epochs", type=int, default=500)
     parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument(
+        "--onnx",
+        action="store_true",
+        help="Also export surrogate.onnx for ONNX Runtime inference.",
+    )
     args = parser.parse_args()
 
     csv_path = Path(args.csv)
@@ -112,6 +155,12 @@ def main():
 
     save_model(model, out_dir / "surrogate_mlp.pt")
     save_meta(out_dir / "meta.json")
+    onnx_path = out_dir / "surrogate.onnx"
+    if args.onnx:
+        save_onnx(model, onnx_path, in_dim=X.shape[1])
+    else:
+        # SurrogatePredictor prefers surrogate.onnx: a stale export would shadow the new weights
+        onnx_path.unlink(missing_ok=True)
 
     print(f"Saved surrogate model and metadata to {out_dir}")
 
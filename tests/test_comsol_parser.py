@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qled_env.comsol_parser import parse_comsol_csv
+
+
+def _write_csv(path, n=500):
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "x": rng.random(n),
+        "z": rng.random(n),
+        "n_electron": rng.random(n) * 1e24,
+        "n_hole": rng.random(n) * 1e24,
+        "R_rad": rng.random(n) * 1e27,
+        "R_nrad": rng.random(n) * 1e26,
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_stream_only_matches_full_parse(tmp_path):
+    path = _write_csv(tmp_path / "comsol.csv")
+    full = parse_comsol_csv(path)
+    streamed = parse_comsol_csv(path, stream_only=True, chunksize=64)
+
+    assert "carrier_map" not in streamed
+    for key in ("EQE", "recomb_overlap", "penalty"):
+        assert streamed[key] == pytest.approx(full[key], rel=1e-9)
+    assert 0.0 <= full["recomb_overlap"] <= 1.0
+
+
+def test_as_arrays_matches_dataframes(tmp_path):
+    path = _write_csv(tmp_path / "comsol.csv")
+    frames = parse_comsol_csv(path)
+    arrays = parse_comsol_csv(path, as_arrays=True)
+
+    assert arrays["carrier_columns"] == ("x", "z", "n_electron", "n_hole")
+    assert arrays["carrier_map"].flags.c_contiguous
+    np.testing.assert_array_equal(arrays["carrier_map"], frames["carrier_map"].to_numpy())
+    np.testing.assert_array_equal(arrays["recomb_profile"], frames["recomb_profile"].to_numpy())
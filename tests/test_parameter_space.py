@@ -0,0 +1,46 @@
+import pickle
+
+import numpy as np
+
+from qled_env.qled_env.parameter_space import ParameterSpace
+
+
+def test_to_real_to_normalized_roundtrip():
+    ps = ParameterSpace()
+    rng = np.random.default_rng(0)
+    x = ps.sample_normalized(rng)
+
+    params = ps.to_real(x)
+    assert list(params) == ps.names
+    for p in ps.params:
+        assert p.low <= params[p.name] <= p.high
+
+    x_back = ps.to_normalized(params)
+    assert x_back.dtype == np.float32
+    np.testing.assert_allclose(x_back, x, atol=1e-6)
+
+
+def test_to_real_clips_out_of_range():
+    ps = ParameterSpace()
+    params = ps.to_real(np.full(ps.dim, 3.0))
+    assert all(params[p.name] == p.high for p in ps.params)
+
+
+def test_constraint_violation_forms_agree():
+    ps = ParameterSpace()
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        x_real = ps.to_real_vec(rng.uniform(-1, 1, ps.dim))
+        values = ps.constraint_violation_values(x_real)
+        assert isinstance(values, tuple)
+        assert ps.constraint_violation(x_real) == dict(zip(ps.constraint_names, values))
+        np.testing.assert_allclose(ps.constraint_violation_vec(x_real), values, atol=1e-9)
+        assert ps.is_hard_invalid(values) == ps.is_hard_invalid(ps.constraint_violation(x_real))
+
+
+def test_parameter_space_pickle_roundtrip():
+    ps = ParameterSpace()
+    ps2 = pickle.loads(pickle.dumps(ps))
+    x_real = ps.to_real_vec(np.random.default_rng(2).uniform(-1, 1, ps.dim))
+    assert ps2.names == ps.names
+    assert ps2.constraint_violation_values(x_real) == ps.constraint_violation_values(x_real)
@@ -1,4 +1,14 @@
-from qled_env.reward_function import compute_reward
+import numpy as np
+import pytest
+
+from qled_env.reward_function import (
+    RewardBatch,
+    RewardConfig,
+    compute_reward,
+    compute_reward_batch,
+    compute_reward_scalar,
+    stack_metrics,
+)
 
 def test_reward_increases_with_eqe_and_overlap():
     low = compute_reward({"EQE": 0.1, "recomb_overlap": 0.6, "penalty": 0.0})
@@ -9,3 +19,128 @@ def test_reward_penalizes_penalty():
     base = compute_reward({"EQE": 0.15, "recomb_overlap": 0.7, "penalty": 0.0})
     penalized = compute_reward({"EQE": 0.15, "recomb_overlap": 0.7, "penalty": 0.1})
     assert penalized < base
+
+def test_reward_batch_matches_scalar():
+    rng = np.random.default_rng(0)
+    metrics_seq, violations, u_prev = [], [], []
+    for i in range(64):
+        metrics_seq.append({
+            "EQE": rng.uniform(0, 40), "recomb_overlap": rng.uniform(0, 1),
+            "inj_balance": rng.uniform(0, 1), "droop": rng.uniform(0, 1),
+            "brightness": rng.uniform(0, 2500), "lifetime": rng.uniform(0, 2200),
+            "leakage": rng.uniform(0, 2), "auger_rate": rng.uniform(0, 2),
+            "penalty": rng.uniform(0, 1), "V_drive": rng.uniform(2, 6),
+            "U_prev": None if i % 3 == 0 else rng.uniform(-3, 3),
+        })
+        violations.append(rng.uniform(-1, 1, size=4))
+        u_prev.append(np.nan if metrics_seq[-1]["U_prev"] is None else metrics_seq[-1]["U_prev"])
+
+    expected = [
+        compute_reward(m, dict(enumerate(v)))[0] for m, v in zip(metrics_seq, violations)
+    ]
+    batched = compute_reward_batch(stack_metrics(metrics_seq), np.array(violations), np.array(u_prev))
+    np.testing.assert_allclose(batched, expected, rtol=0, atol=1e-9)
+
+
+def test_reward_batch_from_metrics_dicts():
+    metrics_seq = [
+        {"EQE": 12.0, "recomb_overlap": 0.8, "inj_balance": 0.7, "lifetime": 950.0, "U_prev": 1.0},
+        {"EQE": float("nan"), "recomb_overlap": 0.3, "penalty": 0.2},
+    ]
+    violations = [{"a": 0.5, "b": -1.0}, 0.0]
+    batch = RewardBatch.from_metrics(metrics_seq, violations)
+
+    expected = [compute_reward(m, v)[0] for m, v in zip(metrics_seq, violations)]
+    np.testing.assert_allclose(compute_reward_batch(batch), expected, rtol=0, atol=1e-9)
+
+
+def test_torch_reward_matches_numpy_batch():
+    torch = pytest.importorskip("torch")
+    from qled_env.qled_env.reward_torch import RewardV10
+
+    rng = np.random.default_rng(1)
+    metrics_seq = [
+        {"EQE": rng.uniform(0, 40), "recomb_overlap": rng.uniform(0, 1),
+         "inj_balance": rng.uniform(0, 1), "brightness": rng.uniform(0, 2500),
+         "lifetime": rng.uniform(0, 2200), "V_drive": rng.uniform(2, 6)}
+        for _ in range(32)
+    ]
+    metrics_arr = stack_metrics(metrics_seq)
+    u_prev = rng.uniform(-3, 3, size=32)
+    u_prev[::4] = np.nan
+
+    expected = compute_reward_batch(metrics_arr, None, u_prev)
+    got = RewardV10()(torch.from_numpy(metrics_arr), None, torch.from_numpy(u_prev))
+    np.testing.assert_allclose(got.numpy(), expected, atol=1e-4)
+
+
+def test_jax_reward_matches_numpy_batch():
+    jnp = pytest.importorskip("jax.numpy")
+    from qled_env.qled_env.reward_jax import compute_reward_jax
+
+    rng = np.random.default_rng(3)
+    metrics_seq = [
+        {"EQE": rng.uniform(0, 40), "recomb_overlap": rng.uniform(0, 1),
+         "inj_balance": rng.uniform(0, 1), "brightness": rng.uniform(0, 2500),
+         "lifetime": rng.uniform(0, 2200), "V_drive": rng.uniform(2, 6)}
+        for _ in range(32)
+    ]
+    metrics_arr = stack_metrics(metrics_seq)
+    violations = rng.uniform(0, 1, size=32)
+    u_prev = rng.uniform(-3, 3, size=32)
+    u_prev[::4] = np.nan
+
+    expected = compute_reward_batch(metrics_arr, violations, u_prev)
+    got = compute_reward_jax(jnp.asarray(metrics_arr), jnp.asarray(violations), jnp.asarray(u_prev))
+    np.testing.assert_allclose(np.asarray(got), expected, atol=1e-4)
+
+
+def test_compute_reward_without_info():
+    m = {"EQE": 0.15, "recomb_overlap": 0.7, "penalty": 0.05}
+    reward, info = compute_reward(m, 0.2, log_info=False)
+    assert reward == compute_reward(m, 0.2)[0]
+    assert len(info) == 0
+
+
+def test_reward_config_threads_through_scalar_and_batch():
+    m = {"EQE": 12.0, "recomb_overlap": 0.3, "inj_balance": 0.5, "lifetime": 600.0, "penalty": 0.1}
+    cfg = RewardConfig(w_core=1.0, target_overlap=0.6, tanh_scale=5.0)
+    custom, info = compute_reward(m, 0.0, cfg=cfg)
+    assert custom != compute_reward(m)[0]
+    assert info["hinge"]["target_overlap"] == 0.6
+    np.testing.assert_allclose(compute_reward_batch(stack_metrics([m]), cfg=cfg), [custom], rtol=0, atol=1e-9)
+
+
+def test_fast_tanh_is_opt_in_and_close():
+    rng = np.random.default_rng(1)
+    metrics_seq = [
+        {"EQE": rng.uniform(0, 40), "recomb_overlap": rng.uniform(0, 1), "inj_balance": rng.uniform(0, 1),
+         "lifetime": rng.uniform(0, 2000), "brightness": rng.uniform(0, 2500), "V_drive": rng.uniform(2, 6)}
+        for _ in range(64)
+    ]
+    cfg = RewardConfig(fast_tanh=True)
+    exact = np.array([compute_reward(m)[0] for m in metrics_seq])
+    fast = np.array([compute_reward(m, cfg=cfg)[0] for m in metrics_seq])
+    np.testing.assert_allclose(fast, exact, rtol=0, atol=0.25)
+    np.testing.assert_allclose(compute_reward_batch(stack_metrics(metrics_seq), cfg=cfg), fast, rtol=0, atol=1e-9)
+
+
+def test_float32_batch_close_to_float64():
+    rng = np.random.default_rng(2)
+    lo = np.array([0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2.0])
+    hi = np.array([45, 1, 1, 1, 2500, 2200, 2, 2, 1, 1, 0.5, 0.3, 6.0])
+    metrics_arr = rng.uniform(lo, hi, size=(4096, lo.size))
+    violations = rng.uniform(0, 1, 4096)
+    u_prev = rng.uniform(-3, 3, 4096)
+    r64 = compute_reward_batch(metrics_arr, violations, u_prev)
+    r32 = compute_reward_batch(metrics_arr, violations, u_prev, dtype=np.float32)
+    assert r32.dtype == np.float32
+    np.testing.assert_allclose(r32, r64, rtol=0, atol=1e-5)
+
+
+def test_violation_tuple_array_and_dict_agree():
+    m = {"EQE": 10.0, "recomb_overlap": 0.5}
+    values = (0.3, -0.2, 0.0, 1.5)
+    expected = compute_reward_scalar(m, dict(enumerate(values)))
+    assert compute_reward_scalar(m, values) == expected
+    assert compute_reward_scalar(m, np.array(values)) == pytest.approx(expected, abs=1e-12)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from qled_env.simulator_interface import QLEDSimulator
 from qled_env.parameter_space import sample_design
 
@@ -10,3 +12,16 @@ def test_mock_simulator_runs():
     assert "recomb_overlap" in metrics
     assert "penalty" in metrics
     assert 0.0 <= metrics["recomb_overlap"] <= 1.0
+
+
+def test_mock_simulator_batch_matches_scalar():
+    sim = QLEDSimulator(use_surrogate=False, use_comsol=False)
+    designs = sample_design(np.random.default_rng(0), n=32)
+    batch = sim.evaluate_batch(designs)
+
+    for i in range(32):
+        design = {k: v[i].item() for k, v in designs.items()}
+        ref = sim.evaluate(design)
+        for k in ref:
+            assert batch[k].shape == (32,)
+            assert abs(batch[k][i] - ref[k]) < 1e-12
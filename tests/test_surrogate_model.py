@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "surrogate_model"))
+
+import train_surrogate  # noqa: E402
+from predict_performance import SurrogatePredictor  # noqa: E402
+
+CSV = Path(__file__).resolve().parents[1] / "data" / "data_designs.csv"
+
+
+def _train(monkeypatch, out_dir, *extra):
+    argv = ["train_surrogate.py", "--csv", str(CSV), "--out_dir", str(out_dir), "--epochs", "5", *extra]
+    monkeypatch.setattr(sys, "argv", argv)
+    train_surrogate.main()
+
+
+def test_retrain_without_onnx_removes_stale_export(tmp_path, monkeypatch):
+    stale = tmp_path / "surrogate.onnx"
+    stale.write_bytes(b"old export")
+    _train(monkeypatch, tmp_path)
+
+    assert not stale.exists()
+    assert (tmp_path / "surrogate_mlp.pt").exists()
+
+
+def test_onnx_export_matches_torch(tmp_path, monkeypatch):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    _train(monkeypatch, tmp_path, "--onnx")
+
+    onnx_pred = SurrogatePredictor(str(tmp_path))
+    torch_pred = SurrogatePredictor(str(tmp_path), use_onnx=False)
+    assert onnx_pred._session is not None
+
+    X, _ = train_surrogate.load_data(CSV)
+    designs = [dict(zip(train_surrogate.FEATURE_COLS, row.tolist())) for row in X]
+    for got, ref in zip(onnx_pred.predict_batch(designs), torch_pred.predict_batch(designs)):
+        np.testing.assert_allclose([got[k] for k in ref], list(ref.values()), rtol=1e-5, atol=1e-6)
+    single = onnx_pred.predict(designs[0])
+    np.testing.assert_allclose(list(single.values()), list(torch_pred.predict(designs[0]).values()), rtol=1e-5, atol=1e-6)
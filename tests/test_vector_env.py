@@ -0,0 +1,175 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+from gymnasium.vector import AutoresetMode
+
+from qled_env.qled_env.parameter_space import ParameterSpace
+from qled_env.qled_env.rl_env import QLEDRLEnv
+from qled_env.qled_env.surrogate_sim import SurrogateSim
+from qled_env.qled_env.vector_env import BatchQLEDRLEnv, make_async_vector_env
+
+
+def test_batch_env_matches_scalar_envs():
+    ps = ParameterSpace()
+    n, max_steps = 4, 6
+    venv = BatchQLEDRLEnv(SurrogateSim(), ps, num_envs=n, max_steps=max_steps, action_scale=0.08, seed=0)
+    obs, _ = venv.reset(seed=0)
+    assert obs.shape == (n, ps.dim) and obs.dtype == np.float32
+
+    envs = []
+    for i in range(n):
+        env = QLEDRLEnv(SurrogateSim(), ps, max_steps=max_steps, action_scale=0.08)
+        env.reset(seed=i)
+        env.x = venv.X[i].copy()
+        env._prev_x = env.x.copy()
+        envs.append(env)
+
+    rng = np.random.default_rng(1)
+    for _ in range(max_steps):
+        actions = rng.uniform(-1, 1, size=(n, ps.dim)).astype(np.float32)
+        obs, rewards, terms, truncs, _ = venv.step(actions)
+        for i, env in enumerate(envs):
+            o, r, te, tr, _ = env.step(actions[i])
+            np.testing.assert_allclose(obs[i], o, atol=1e-6)
+            assert abs(rewards[i] - r) < 1e-6
+            assert terms[i] == te and truncs[i] == tr
+    assert truncs.all()
+
+    # next step auto-resets every env: zero reward, fresh episode
+    obs, rewards, terms, truncs, _ = venv.step(np.zeros((n, ps.dim), dtype=np.float32))
+    assert not rewards.any() and not terms.any() and not truncs.any()
+    assert (venv.step_count == 0).all()
+
+
+def test_batch_env_same_step_autoreset():
+    ps = ParameterSpace()
+    n, max_steps = 3, 2
+    kwargs = dict(num_envs=n, max_steps=max_steps, seed=0)
+    next_env = BatchQLEDRLEnv(SurrogateSim(), ps, **kwargs)
+    same_env = BatchQLEDRLEnv(SurrogateSim(), ps, autoreset_mode=AutoresetMode.SAME_STEP, **kwargs)
+    next_env.reset(seed=0)
+    same_env.reset(seed=0)
+
+    actions = np.full((n, ps.dim), 0.3, dtype=np.float32)
+    for _ in range(max_steps):
+        ref_obs, ref_rewards, _, _, _ = next_env.step(actions)
+        obs, rewards, _, truncs, infos = same_env.step(actions)
+        np.testing.assert_allclose(rewards, ref_rewards)
+    assert truncs.all() and infos["_final_obs"].all()
+    np.testing.assert_allclose(infos["final_obs"], ref_obs)
+
+    # the fresh episodes are already in obs: same draws NEXT_STEP makes one step later
+    next_env.step(actions)
+    np.testing.assert_allclose(obs, next_env.X)
+    assert (same_env.step_count == 0).all()
+
+
+def test_surrogate_evaluate_batch_matches_evaluate():
+    ps = ParameterSpace()
+    sim = SurrogateSim()
+    rng = np.random.default_rng(3)
+    # past the box edges too, so every hinge / clamp branch is hit
+    x_real = ps.to_real_vec(rng.uniform(-1.3, 1.3, size=(200, ps.dim)))
+
+    batch = sim.evaluate_batch({name: x_real[:, j] for j, name in enumerate(ps.names)})
+    for i in range(x_real.shape[0]):
+        ref = sim.evaluate({name: float(x_real[i, j]) for j, name in enumerate(ps.names)})
+        fast = sim.evaluate_array(x_real[i], ps.names)
+        assert {key: fast[key] for key in ref} == ref
+        for key, value in ref.items():
+            assert batch[key].shape == (x_real.shape[0],)
+            assert np.isclose(batch[key][i], value, rtol=1e-12, atol=1e-12), key
+
+
+def test_surrogate_metrics_rejects_non_field_keys():
+    ps = ParameterSpace()
+    m = SurrogateSim().evaluate_array(ps.to_real_vec(np.zeros(ps.dim)), ps.names)
+    for key in ("keys", "to_info_dict", "__class__", "not_a_metric"):
+        assert key not in m
+        assert m.get(key) is None
+        assert m.get(key, 1.5) == 1.5
+        with pytest.raises(KeyError):
+            m[key]
+        with pytest.raises(KeyError):
+            m[key] = 0.0
+    assert "EQE" in m and m["EQE"] == m.get("EQE") == m.EQE
+    assert set(m) == set(m.to_info_dict())
+
+
+def test_async_vector_env_matches_scalar_envs():
+    ps = ParameterSpace()
+    n, max_steps = 2, 3
+    venv = make_async_vector_env(SurrogateSim, ps, num_envs=n, seed=5, max_steps=max_steps, log_reward_info=False)
+    try:
+        obs, _ = venv.reset(seed=5)
+        envs = [QLEDRLEnv(SurrogateSim(), ps, max_steps=max_steps, log_reward_info=False) for _ in range(n)]
+        ref_obs = np.stack([env.reset(seed=5 + i)[0] for i, env in enumerate(envs)])
+        np.testing.assert_allclose(obs, ref_obs)
+
+        rng = np.random.default_rng(1)
+        for _ in range(max_steps):
+            actions = rng.uniform(-1.0, 1.0, size=(n, ps.dim)).astype(np.float32)
+            _, rewards, _, truncations, infos = venv.step(actions)
+            ref = [env.step(actions[i]) for i, env in enumerate(envs)]
+            np.testing.assert_allclose(rewards, [r[1] for r in ref], rtol=1e-6, atol=1e-6)
+
+        # same-step autoreset: the terminal observation is kept in infos
+        assert truncations.all()
+        np.testing.assert_allclose(np.stack(infos["final_obs"]), np.stack([r[0] for r in ref]))
+    finally:
+        venv.close()
+
+
+def test_jax_surrogate_matches_numpy_batch():
+    pytest.importorskip("jax")
+    from qled_env.qled_env.surrogate_jax import SurrogateSimJAX
+
+    ps = ParameterSpace()
+    rng = np.random.default_rng(4)
+    x_real = ps.to_real_vec(rng.uniform(-1.3, 1.3, size=(256, ps.dim)))
+    cols = {name: x_real[:, j] for j, name in enumerate(ps.names)}
+
+    ref = SurrogateSim().evaluate_batch(cols)
+    got = SurrogateSimJAX().evaluate_batch(cols)
+    assert got.keys() == ref.keys()
+    for key in ref:
+        # float32 on device
+        np.testing.assert_allclose(got[key], ref[key], rtol=1e-4, atol=1e-5, err_msg=key)
+
+
+@pytest.mark.parametrize("log_reward_info", [True, False])
+def test_env_step_info_is_json_serializable(log_reward_info):
+    env = QLEDRLEnv(SurrogateSim(), ParameterSpace(), seed=0, log_reward_info=log_reward_info)
+    _, info = env.reset(seed=0)
+    json.dumps(info)
+    for _ in range(3):
+        _, _, _, _, info = env.step(env.action_space.sample())
+        assert type(info["metrics"]) is dict
+        json.dumps(info)
+
+
+def test_envs_pickle_roundtrip():
+    ps = ParameterSpace()
+    env = pickle.loads(pickle.dumps(QLEDRLEnv(SurrogateSim(), ps, seed=0)))
+    obs, _ = env.reset(seed=0)
+    env.step(np.zeros_like(obs))
+    venv = pickle.loads(pickle.dumps(BatchQLEDRLEnv(SurrogateSim(), ps, num_envs=2, seed=0)))
+    obs, _ = venv.reset(seed=0)
+    venv.step(np.zeros_like(obs))
+
+
+def test_env_step_returns_fresh_observations():
+    env = QLEDRLEnv(SurrogateSim(), ParameterSpace(), seed=0)
+    obs, _ = env.reset(seed=0)
+    stored = [obs]
+    for _ in range(3):
+        obs, *_ = env.step(np.full(env.action_space.shape, 0.5, dtype=np.float32))
+        stored.append(obs)
+    snapshot = [o.copy() for o in stored]
+    env.step(np.full(env.action_space.shape, -0.5, dtype=np.float32))
+    assert len({id(o) for o in stored}) == len(stored)
+    for o, s in zip(stored, snapshot):
+        np.testing.assert_array_equal(o, s)
+    assert not np.array_equal(stored[0], stored[-1])
@@ -1,10 +1,15 @@
 from stable_baselines3 import PPO
 from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import SubprocVecEnv
 
 from qled_env.qled_env.rl_env import QLEDRLEnv
 from qled_env.qled_env.parameter_space import ParameterSpace
 from qled_env.qled_env.surrogate_sim import SurrogateSim
 
+# rollout workers (one env per subprocess) and total steps collected per PPO update
+N_ENVS = 4
+N_STEPS = 256
+
 
 def make_env(seed: int = 0):
     ps = ParameterSpace()
@@ -15,18 +20,21 @@ def make_env(seed: int = 0):
         action_scale=0.08,
         include_metrics_in_obs=False,
         seed=seed,
+        # only metrics/params are read below; skip the per-step reward breakdown
+        log_reward_info=False,
     )
     return Monitor(env)
 
 
 if __name__ == "__main__":
-    env = make_env(seed=0)
+    train_env = SubprocVecEnv([lambda i=i: make_env(seed=i) for i in range(N_ENVS)])
 
     model = PPO(
         policy="MlpPolicy",
-        env=env,
+        env=train_env,
         verbose=1,
-        n_steps=256,
+        # per-env steps, so each rollout is still N_STEPS transitions in total
+        n_steps=N_STEPS // N_ENVS,
         batch_size=64,
         gamma=0.98,
         learning_rate=3e-4,
@@ -34,7 +42,9 @@ if __name__ == "__main__":
     )
 
     model.learn(total_timesteps=50_000)
+    train_env.close()
 
+    env = make_env(seed=0)
     obs, info = env.reset()
     total_r = 0.0
     last_info = info